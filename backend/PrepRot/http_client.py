@@ -0,0 +1,188 @@
+"""
+Shared client for outbound HTTP calls (LeetCode, Google OAuth).
+
+One requests.Session with a keep-alive connection pool is reused by every
+caller and thread. Each host gets its own timeout/retry settings from
+settings.OUTBOUND_HTTP and its own circuit breaker, so a degraded upstream
+fails fast instead of holding workers for the full timeout.
+"""
+import random
+import threading
+import time
+from urllib.parse import urlparse
+from django.conf import settings
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds, then lets a single trial call through
+    (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, threshold, reset_timeout):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self.trial_in_flight:
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """
+        End a trial call that produced no verdict on the host (it failed
+        locally), so the next call can be the trial instead
+        """
+        with self._lock:
+            self.trial_in_flight = False
+
+
+_session = None
+_session_lock = threading.Lock()
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_session():
+    """
+    The process-wide pooled session, created on first use
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            config = settings.OUTBOUND_HTTP['default']
+            adapter = HTTPAdapter(
+                pool_connections=config['pool_connections'],
+                pool_maxsize=config['pool_maxsize']
+            )
+            _session = requests.Session()
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+
+def host_config(host):
+    """
+    Settings for `host`: the 'default' entry of OUTBOUND_HTTP overridden by
+    the host's own entry, if any
+    """
+    config = dict(settings.OUTBOUND_HTTP['default'])
+    config.update(settings.OUTBOUND_HTTP.get(host, {}))
+    return config
+
+
+def get_breaker(host):
+    with _breakers_lock:
+        if host not in _breakers:
+            config = host_config(host)
+            _breakers[host] = CircuitBreaker(config['breaker_threshold'], config['breaker_reset'])
+        return _breakers[host]
+
+
+def backoff_delay(attempt, base, maximum):
+    """
+    Full-jitter exponential backoff: a random delay in [0, base * 2^attempt],
+    capped at `maximum`
+    """
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+def request(method, url, retries=None, timeout=None, **kwargs):
+    """
+    Send a request through the shared session.
+
+    Connection errors, timeouts and 5xx responses count as failures: they are
+    retried up to `retries` times with jittered exponential backoff and are
+    reported to the host's circuit breaker. Other requests exceptions (e.g.
+    a broken chunked response) also count as failures but are raised
+    without retrying. While the circuit is open, CircuitOpenError is raised
+    without contacting the host.
+
+    Returns: the requests.Response (the last one if every attempt got a 5xx)
+    """
+    host = urlparse(url).hostname or ''
+    config = host_config(host)
+    breaker = get_breaker(host)
+
+    if retries is None:
+        retries = config['retries']
+    if timeout is None:
+        timeout = (config['connect_timeout'], config['read_timeout'])
+
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        try:
+            response = get_session().request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            breaker.record_failure()
+            if attempt == retries:
+                raise
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Not the host's fault, but a half-open trial must still end
+            breaker.release_trial()
+            raise
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success()
+                return response
+            breaker.record_failure()
+            if attempt == retries:
+                return response
+
+        time.sleep(backoff_delay(attempt, config['backoff_base'], config['backoff_max']))
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
@@ -0,0 +1,46 @@
+import base64
+import json
+
+
+def encode_cursor(*values):
+    """
+    Encode the sort key of the last row on a page into an opaque cursor string
+    """
+    raw = json.dumps(list(values), separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, size, types=None):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    `types`, if given, holds one type (or tuple of types) per value, as for
+    isinstance; booleans never pass for int. Cursors come from clients, so
+    callers should pass it whenever the values reach a query.
+
+    Raises ValueError if it is malformed, does not hold `size` values or
+    holds a value of the wrong type.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    if types is not None:
+        for value, expected in zip(values, types):
+            if isinstance(value, bool) or not isinstance(value, expected):
+                raise ValueError('Invalid cursor')
+    return values
+
+
+def parse_limit(value, default=50, maximum=200):
+    """
+    Parse a `limit` query parameter, clamped to 1..maximum.
+    Raises ValueError if it is not an integer.
+    """
+    if value in (None, ''):
+        return default
+    return max(1, min(int(value), maximum))
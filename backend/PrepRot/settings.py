@@ -122,6 +122,12 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Transactions take the write lock when they start, so concurrent
+            # read-then-write transactions queue (up to the busy timeout)
+            # instead of failing with "database is locked"
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
@@ -169,3 +175,62 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Custom user model
 AUTH_USER_MODEL = 'accounts.User'
+
+# LeetCode integration
+LEETCODE_REFRESH_MAX_WORKERS = int(os.getenv('LEETCODE_REFRESH_MAX_WORKERS', '16'))
+LEETCODE_REFRESH_CHUNK_SIZE = int(os.getenv('LEETCODE_REFRESH_CHUNK_SIZE', '500'))
+LEETCODE_GRAPHQL_URL = os.getenv('LEETCODE_GRAPHQL_URL', 'https://leetcode.com/graphql')
+LEETCODE_BATCH_SIZE = int(os.getenv('LEETCODE_BATCH_SIZE', '50'))
+LEETCODE_REFRESH_JOB_TIMEOUT = int(os.getenv('LEETCODE_REFRESH_JOB_TIMEOUT', '600'))
+LEETCODE_STATS_CACHE_TTL = int(os.getenv('LEETCODE_STATS_CACHE_TTL', '300'))
+LEETCODE_STATS_STALE_GRACE = int(os.getenv('LEETCODE_STATS_STALE_GRACE', '3600'))
+LEETCODE_STATS_NEGATIVE_TTL = int(os.getenv('LEETCODE_STATS_NEGATIVE_TTL', '60'))
+
+# Outbound HTTP (PrepRot/http_client.py): defaults plus per-host overrides
+OUTBOUND_HTTP = {
+    'default': {
+        'connect_timeout': 3.05,
+        'read_timeout': 10,
+        'retries': 2,
+        'backoff_base': 0.5,
+        'backoff_max': 8,
+        'breaker_threshold': 5,
+        'breaker_reset': 30,
+        'pool_connections': 10,
+        'pool_maxsize': int(os.getenv('OUTBOUND_HTTP_POOL_SIZE', '32')),
+    },
+    'leetcode.com': {
+        'read_timeout': 10,
+        'retries': 2,
+    },
+    'oauth2.googleapis.com': {
+        # Authorization codes are single-use, so token exchanges are never retried
+        'retries': 0,
+    },
+}
+
+# Outbound LeetCode rate limit (token bucket shared through the DB)
+LEETCODE_RATE_LIMIT = float(os.getenv('LEETCODE_RATE_LIMIT', '2'))  # requests per second
+LEETCODE_RATE_BURST = int(os.getenv('LEETCODE_RATE_BURST', '5'))
+LEETCODE_RATE_MAX_WAIT = float(os.getenv('LEETCODE_RATE_MAX_WAIT', '60'))
+LEETCODE_THROTTLE_RETRIES = int(os.getenv('LEETCODE_THROTTLE_RETRIES', '2'))
+
+# Problem catalog
+# Catalog totals are invalidated on every Problem change; the TTL only bounds
+# staleness for other processes when the cache is per-process (LocMemCache).
+PROBLEM_CATALOG_CACHE_TTL = int(os.getenv('PROBLEM_CATALOG_CACHE_TTL', '300'))
+# Seconds between catalog version checks by each worker's in-process snapshot
+PROBLEM_CATALOG_CHECK_INTERVAL = float(os.getenv('PROBLEM_CATALOG_CHECK_INTERVAL', '1'))
+# Delta sync (problems/sync.py): watermarks trail the clock by PROBLEM_SYNC_LAG
+# seconds so rows from transactions still in flight are sent on the next sync;
+# clients older than the tombstone retention get a full resync
+PROBLEM_SYNC_LAG = int(os.getenv('PROBLEM_SYNC_LAG', '5'))
+PROBLEM_SYNC_TOMBSTONE_DAYS = int(os.getenv('PROBLEM_SYNC_TOMBSTONE_DAYS', '30'))
+
+# Mock interviews: bookings longer than this are rejected; it also bounds
+# the index range scanned by the overlap check (interviews/scheduling.py)
+MOCK_INTERVIEW_MAX_DURATION = int(os.getenv('MOCK_INTERVIEW_MAX_DURATION', '240'))  # minutes
+# Free-slot search: slot starts are aligned to this many minutes and a
+# single search covers at most MOCK_INTERVIEW_SLOT_MAX_DAYS
+MOCK_INTERVIEW_SLOT_STEP = int(os.getenv('MOCK_INTERVIEW_SLOT_STEP', '15'))  # minutes
+MOCK_INTERVIEW_SLOT_MAX_DAYS = int(os.getenv('MOCK_INTERVIEW_SLOT_MAX_DAYS', '42'))
@@ -0,0 +1,97 @@
+import hashlib
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_stats(username):
+    """
+    Deterministic Easy/Medium/Hard counts for a username
+    """
+    digest = hashlib.sha256(username.encode()).digest()
+    return {"Easy": digest[0] * 2, "Medium": digest[1] * 2, "Hard": digest[2]}
+
+
+def fake_matched_user(username):
+    if username.startswith('missing'):
+        return None
+    stats = fake_stats(username)
+    return {
+        "username": username,
+        "submitStats": {
+            "acSubmissionNum": [
+                {"difficulty": "All", "count": sum(stats.values())},
+                *({"difficulty": difficulty, "count": count} for difficulty, count in stats.items())
+            ]
+        }
+    }
+
+
+class FakeLeetCodeHandler(BaseHTTPRequestHandler):
+    """
+    Answers LeetCode GraphQL profile queries, both the single-user query
+    ($username) and aliased batch queries ($u0, $u1, ...). Usernames starting
+    with "missing" do not exist.
+    """
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._send(400, {"errors": [{"message": "Invalid JSON"}]})
+
+        latency = server.latency + random.uniform(0, server.jitter)
+        if latency:
+            time.sleep(latency)
+
+        roll = random.random()
+        if roll < server.throttle_rate:
+            return self._send(429, {"errors": [{"message": "Too many requests"}]}, {'Retry-After': str(server.retry_after)})
+        if roll < server.throttle_rate + server.error_rate:
+            return self._send(502, {"errors": [{"message": "Bad gateway"}]})
+
+        variables = payload.get("variables") or {}
+        if "username" in variables:
+            return self._send(200, {"data": {"matchedUser": fake_matched_user(variables["username"])}})
+
+        data = {}
+        errors = []
+        for alias, username in variables.items():
+            data[alias] = fake_matched_user(username)
+            if data[alias] is None:
+                errors.append({"message": "That user does not exist.", "path": [alias]})
+        body = {"data": data}
+        if errors:
+            body["errors"] = errors
+        self._send(200, body)
+
+    def _send(self, code, body, headers=None):
+        raw = json.dumps(body).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(raw)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1):
+    """
+    Build (but do not start) a fake LeetCode GraphQL server. Latencies are in
+    seconds; error_rate and throttle_rate are probabilities per request.
+    """
+    server = ThreadingHTTPServer((host, port), FakeLeetCodeHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.throttle_rate = throttle_rate
+    server.retry_after = retry_after
+    return server
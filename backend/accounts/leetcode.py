@@ -0,0 +1,239 @@
+from django.conf import settings
+from PrepRot import http_client
+from .rate_limit import RateLimited, acquire, block, parse_retry_after
+
+RATE_LIMIT_KEY = 'leetcode-graphql'
+
+STATS_FIELDS = """
+        username
+        submitStats {
+          acSubmissionNum {
+            difficulty
+            count
+          }
+        }
+"""
+
+SINGLE_QUERY = """
+    query userProfile($username: String!) {
+      matchedUser(username: $username) {%s      }
+    }
+""" % STATS_FIELDS
+
+# Returned in place of stats when a lookup failed for a reason other than
+# the user not existing (5xx, timeout, open circuit, malformed response).
+# None keeps meaning "LeetCode says there is no such user".
+FETCH_FAILED = object()
+
+
+class LeetCodeThrottled(RateLimited):
+    """
+    LeetCode kept rate limiting us. `usernames` could not be fetched;
+    `results` holds whatever was fetched before that (batch calls only).
+    """
+
+    def __init__(self, retry_after, usernames=(), results=None):
+        self.usernames = list(usernames)
+        self.results = results or {}
+        super().__init__(retry_after, f"LeetCode is rate limiting requests, retry after {retry_after:.0f}s")
+
+
+class LeetCodeUnavailable(Exception):
+    """
+    A lookup failed for a reason other than the user not existing
+    (5xx, timeout, open circuit, malformed response)
+    """
+
+
+def post_graphql(payload):
+    """
+    POST a GraphQL payload to LeetCode under the shared outbound rate limit.
+    A 429 blocks the bucket for the Retry-After period and is retried up to
+    LEETCODE_THROTTLE_RETRIES times; throttling never counts as a failed lookup.
+    Raises LeetCodeThrottled if LeetCode is still throttling us.
+    """
+    retry_after = 0.0
+    for attempt in range(settings.LEETCODE_THROTTLE_RETRIES + 1):
+        try:
+            acquire(
+                RATE_LIMIT_KEY,
+                settings.LEETCODE_RATE_LIMIT,
+                settings.LEETCODE_RATE_BURST,
+                settings.LEETCODE_RATE_MAX_WAIT
+            )
+        except RateLimited as e:
+            raise LeetCodeThrottled(e.retry_after)
+
+        response = http_client.post(settings.LEETCODE_GRAPHQL_URL, json=payload)
+        if response.status_code != 429:
+            return response
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        block(RATE_LIMIT_KEY, retry_after)
+
+    raise LeetCodeThrottled(retry_after)
+
+
+def parse_matched_user(matched_user):
+    """
+    Convert a matchedUser GraphQL object into {"Easy": n, "Medium": n, "Hard": n}
+    """
+    stats = matched_user["submitStats"]["acSubmissionNum"]
+
+    result = {"Easy": 0, "Medium": 0, "Hard": 0}
+    for item in stats:
+        difficulty = item["difficulty"]
+        count = item["count"]
+        if difficulty in result:
+            result[difficulty] = count
+
+    return result
+
+
+def failures_to_none(results):
+    """
+    Map FETCH_FAILED to None for callers that only care whether stats exist
+    """
+    return {username: None if stats is FETCH_FAILED else stats for username, stats in results.items()}
+
+
+def fetch_user_stats(username):
+    """
+    Fetch one user's LeetCode stats using GraphQL API
+    Returns: dict with easy, medium, hard problem counts, None if the user
+    does not exist, or FETCH_FAILED if the lookup itself failed
+    Raises LeetCodeThrottled if LeetCode is rate limiting us
+    """
+    variables = {"username": username}
+
+    try:
+        response = post_graphql({"query": SINGLE_QUERY, "variables": variables})
+
+        if response.status_code != 200:
+            return FETCH_FAILED
+
+        data = response.json().get("data")
+        if not isinstance(data, dict) or "matchedUser" not in data:
+            return FETCH_FAILED
+
+        # A null matchedUser on a 200 is LeetCode's "user does not exist"
+        if data["matchedUser"] is None:
+            return None
+
+        return parse_matched_user(data["matchedUser"])
+
+    except LeetCodeThrottled:
+        raise
+    except Exception as e:
+        print(f"Error fetching LeetCode stats for {username}: {str(e)}")
+        return FETCH_FAILED
+
+
+def build_batch_query(count):
+    """
+    Build a GraphQL query with one aliased matchedUser field per username.
+    Variables are named u0..u{count-1} and so are the aliases.
+    """
+    params = ", ".join(f"$u{i}: String!" for i in range(count))
+    fields = "".join(
+        f"\n      u{i}: matchedUser(username: $u{i}) {{{STATS_FIELDS}      }}"
+        for i in range(count)
+    )
+    return f"\n    query userProfiles({params}) {{{fields}\n    }}\n"
+
+
+def _fetch_batch(usernames):
+    """
+    Send one aliased GraphQL request for `usernames`.
+    Returns: dict username -> stats (None for unknown users, FETCH_FAILED
+    for unreadable entries), or None if the whole batch was rejected.
+    Raises LeetCodeThrottled if LeetCode is rate limiting us
+    """
+    variables = {f"u{i}": username for i, username in enumerate(usernames)}
+
+    try:
+        response = post_graphql({"query": build_batch_query(len(usernames)), "variables": variables})
+
+        if response.status_code != 200:
+            return None
+
+        data = response.json().get("data")
+        if not isinstance(data, dict):
+            return None
+
+    except LeetCodeThrottled:
+        raise
+    except Exception as e:
+        print(f"Error fetching LeetCode stats for batch of {len(usernames)}: {str(e)}")
+        return None
+
+    # A null alias means that user does not exist; a missing or malformed
+    # one is a failed lookup. Neither affects the rest of the batch.
+    results = {}
+    for i, username in enumerate(usernames):
+        alias = f"u{i}"
+        if alias not in data:
+            results[username] = FETCH_FAILED
+            continue
+        try:
+            results[username] = parse_matched_user(data[alias]) if data[alias] is not None else None
+        except (KeyError, TypeError):
+            results[username] = FETCH_FAILED
+
+    return results
+
+
+def fetch_stats_batch(usernames, batch_size=None):
+    """
+    Fetch LeetCode stats for many usernames with as few requests as possible.
+
+    Usernames are split into batches of `batch_size`, each sent as a single
+    aliased GraphQL request. If LeetCode rejects a batch, its usernames are
+    fetched one by one instead.
+
+    Returns: dict username -> stats dict, None for unknown users or
+    FETCH_FAILED for failed lookups
+    Raises LeetCodeThrottled (carrying the partial results) if some usernames
+    could not be fetched because LeetCode is rate limiting us
+    """
+    if batch_size is None:
+        batch_size = settings.LEETCODE_BATCH_SIZE
+    batch_size = max(1, batch_size)
+
+    usernames = list(dict.fromkeys(usernames))
+    results = {}
+    throttled = []
+    retry_after = 0.0
+
+    for start in range(0, len(usernames), batch_size):
+        batch = usernames[start:start + batch_size]
+
+        try:
+            batch_results = _fetch_batch(batch) if len(batch) > 1 else None
+        except LeetCodeThrottled as e:
+            throttled.extend(batch)
+            retry_after = max(retry_after, e.retry_after)
+            continue
+
+        if batch_results is None:
+            batch_results = {}
+            for username in batch:
+                try:
+                    batch_results[username] = fetch_user_stats(username)
+                except LeetCodeThrottled as e:
+                    throttled.append(username)
+                    retry_after = max(retry_after, e.retry_after)
+
+        results.update(batch_results)
+
+    if throttled:
+        raise LeetCodeThrottled(retry_after, usernames=throttled, results=results)
+
+    return results
+
+
+def calculate_leetcode_score(easy, medium, hard):
+    """
+    Calculate weighted LeetCode score: Easy×1 + Medium×2 + Hard×3
+    """
+    return (easy * 1) + (medium * 2) + (hard * 3)
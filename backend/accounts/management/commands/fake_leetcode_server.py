@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from accounts.fake_leetcode import make_server
+
+class Command(BaseCommand):
+    help = 'Run a local stand-in for the LeetCode GraphQL API (point LEETCODE_GRAPHQL_URL at it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', type=str, default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=100, help='Base response latency in ms')
+        parser.add_argument('--jitter', type=float, default=50, help='Extra random latency in ms')
+        parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 502')
+        parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+        parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+
+    def handle(self, *args, **options):
+        server = make_server(
+            host=options['host'],
+            port=options['port'],
+            latency=options['latency'] / 1000,
+            jitter=options['jitter'] / 1000,
+            error_rate=options['error_rate'],
+            throttle_rate=options['throttle_rate'],
+            retry_after=options['retry_after']
+        )
+        host, port = server.server_address[:2]
+        
+        self.stdout.write(
+            self.style.SUCCESS(f"🧪 Fake LeetCode GraphQL API on http://{host}:{port}/graphql")
+        )
+        self.stdout.write(f"   Set LEETCODE_GRAPHQL_URL=http://{host}:{port}/graphql to use it")
+        
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
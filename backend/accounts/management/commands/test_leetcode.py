@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
-from accounts.views import get_leetcode_stats, calculate_leetcode_score
+from accounts.leetcode import LeetCodeThrottled, calculate_leetcode_score
+from accounts.stats_cache import get_cached_stats, get_cache_counters
 
 class Command(BaseCommand):
     help = 'Test LeetCode API functionality'
@@ -12,7 +13,13 @@ class Command(BaseCommand):
         
         self.stdout.write(f"🔍 Fetching LeetCode stats for: {username}")
         
-        stats = get_leetcode_stats(username)
+        try:
+            stats = get_cached_stats(username)
+        except LeetCodeThrottled as e:
+            self.stdout.write(
+                self.style.WARNING(f"⏳ LeetCode is rate limiting us, retry after {e.retry_after:.0f}s")
+            )
+            return
         
         if not stats:
             self.stdout.write(
@@ -32,3 +39,6 @@ class Command(BaseCommand):
         score = calculate_leetcode_score(stats['Easy'], stats['Medium'], stats['Hard'])
         self.stdout.write(f"\n🏆 Calculated Score: {score}")
         self.stdout.write(f"Formula: ({stats['Easy']} × 1) + ({stats['Medium']} × 2) + ({stats['Hard']} × 3) = {score}")
+        
+        counters = get_cache_counters()
+        self.stdout.write(f"\n🗄️ Stats cache: hit ratio {counters['hit_ratio']:.0%}, {counters['fetches']} fetches, avg fetch {counters['avg_fetch_seconds'] * 1000:.0f} ms")
@@ -11,3 +11,14 @@ class User(AbstractUser):
     
     def __str__(self):
         return self.username
+
+
+class OutboundRateLimit(models.Model):
+    """Token bucket state for an outbound API, shared by all threads and worker processes"""
+    key = models.CharField(max_length=100, unique=True)
+    tokens = models.FloatField(default=0)
+    updated_at = models.FloatField(default=0, help_text="Unix time of the last refill")
+    blocked_until = models.FloatField(default=0, help_text="Unix time until which the upstream asked us to back off")
+    
+    def __str__(self):
+        return f"{self.key}: {self.tokens:.2f} tokens"
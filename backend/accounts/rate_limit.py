@@ -0,0 +1,105 @@
+import time
+from email.utils import parsedate_to_datetime
+from django.db import IntegrityError
+from django.db.models import F, Value, FloatField
+from django.db.models.functions import Greatest, Least
+from .models import OutboundRateLimit
+
+
+class RateLimited(Exception):
+    """Raised when no token became available within the allowed wait"""
+
+    def __init__(self, retry_after, message=None):
+        self.retry_after = retry_after
+        super().__init__(message or f"Rate limited, retry after {retry_after:.1f}s")
+
+
+def _bucket(key, capacity):
+    try:
+        bucket, _ = OutboundRateLimit.objects.get_or_create(
+            key=key,
+            defaults={'tokens': capacity, 'updated_at': time.time()}
+        )
+    except IntegrityError:
+        bucket = OutboundRateLimit.objects.get(key=key)
+    return bucket
+
+
+def _try_take(key, rate, capacity, now):
+    """
+    Refill and take one token in a single conditional UPDATE, so concurrent
+    processes never over-spend the bucket.
+    Returns: True if a token was taken
+    """
+    available = Least(
+        Value(float(capacity)),
+        F('tokens') + (Value(now) - F('updated_at')) * Value(float(rate)),
+        output_field=FloatField()
+    )
+    return OutboundRateLimit.objects.filter(
+        key=key,
+        blocked_until__lte=now
+    ).alias(
+        available=available
+    ).filter(
+        available__gte=1
+    ).update(
+        tokens=available - 1,
+        updated_at=now
+    ) == 1
+
+
+def acquire(key, rate, capacity, max_wait):
+    """
+    Block until a token for `key` is available (refilled at `rate` per second,
+    up to `capacity`) or the upstream's Retry-After block has passed.
+    Raises RateLimited if that would take longer than `max_wait` seconds.
+    """
+    deadline = time.monotonic() + max_wait
+    _bucket(key, capacity)
+
+    while True:
+        now = time.time()
+        if _try_take(key, rate, capacity, now):
+            return
+
+        bucket = OutboundRateLimit.objects.get(key=key)
+        if bucket.blocked_until > now:
+            wait = bucket.blocked_until - now
+        else:
+            tokens = min(capacity, bucket.tokens + (now - bucket.updated_at) * rate)
+            wait = max(0.0, (1 - tokens) / rate)
+
+        remaining = deadline - time.monotonic()
+        if wait > remaining:
+            raise RateLimited(wait)
+        time.sleep(max(wait, 0.01))
+
+
+def block(key, seconds):
+    """
+    Stop handing out tokens for `key` for `seconds` (e.g. from Retry-After)
+    """
+    until = time.time() + seconds
+    OutboundRateLimit.objects.filter(key=key).update(
+        tokens=0,
+        # Refilling restarts once the block is over
+        updated_at=Greatest(F('updated_at'), Value(until), output_field=FloatField()),
+        blocked_until=Greatest(F('blocked_until'), Value(until), output_field=FloatField())
+    )
+
+
+def parse_retry_after(value, default=1.0):
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,242 @@
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from .leetcode import FETCH_FAILED, LeetCodeThrottled, LeetCodeUnavailable, failures_to_none, fetch_stats_batch
+
+CACHE_KEY_PREFIX = 'leetcode-stats:'
+REVALIDATE_LOCK_PREFIX = 'leetcode-stats-revalidate:'
+
+_counters_lock = threading.Lock()
+_counters = {
+    'hits': 0,
+    'stale_hits': 0,
+    'negative_hits': 0,
+    'misses': 0,
+    'fetches': 0,
+    'fetch_failures': 0,
+    'throttled': 0,
+    'fetch_seconds': 0.0,
+    'max_fetch_seconds': 0.0,
+}
+
+# Single-flight: one in-process lock per username currently being fetched
+_inflight_lock = threading.Lock()
+_inflight = {}
+
+
+def _cache_key(username):
+    return CACHE_KEY_PREFIX + username.lower()
+
+
+def _count(name, amount=1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def _with_ratios(counters):
+    lookups = counters['hits'] + counters['stale_hits'] + counters['negative_hits'] + counters['misses']
+    served = lookups - counters['misses']
+    counters['hit_ratio'] = round(served / lookups, 4) if lookups else 0.0
+    counters['avg_fetch_seconds'] = round(counters['fetch_seconds'] / counters['fetches'], 4) if counters['fetches'] else 0.0
+    return counters
+
+
+def get_cache_counters():
+    """
+    Snapshot of this process's stats cache counters, including hit ratio
+    and average fetch latency
+    """
+    with _counters_lock:
+        counters = dict(_counters)
+    return _with_ratios(counters)
+
+
+def counters_since(snapshot):
+    """
+    The counters accumulated since `snapshot` (an earlier get_cache_counters()
+    result), with hit ratio and average fetch latency for that interval.
+    max_fetch_seconds stays the process-wide maximum.
+    """
+    current = get_cache_counters()
+    counters = {name: current[name] - snapshot[name] for name in _counters if name != 'max_fetch_seconds'}
+    counters['fetch_seconds'] = round(counters['fetch_seconds'], 4)
+    counters['max_fetch_seconds'] = current['max_fetch_seconds']
+    return _with_ratios(counters)
+
+
+def _store(results):
+    """
+    Write fetched results to the cache. Unknown users are cached for the
+    shorter negative TTL; found users stay for TTL + stale grace. Failed
+    lookups are not cached at all, so an outage never replaces a good
+    (possibly stale) entry with "user not found".
+    """
+    now = time.time()
+    found = {}
+    for username, stats in results.items():
+        if stats is FETCH_FAILED:
+            _count('fetch_failures')
+            continue
+        entry = {'stats': stats, 'fetched_at': now}
+        if stats is None:
+            cache.set(_cache_key(username), entry, settings.LEETCODE_STATS_NEGATIVE_TTL)
+        else:
+            found[_cache_key(username)] = entry
+    if found:
+        cache.set_many(found, settings.LEETCODE_STATS_CACHE_TTL + settings.LEETCODE_STATS_STALE_GRACE)
+
+
+def _fetch(usernames, batch_size=None):
+    """
+    Fetch from LeetCode, record latency and populate the cache. Throttled
+    and failed usernames are never cached; LeetCodeThrottled is re-raised
+    after the partial results are stored.
+    Returns: dict username -> stats, None (unknown user) or FETCH_FAILED
+    """
+    started = time.monotonic()
+    try:
+        results = fetch_stats_batch(usernames, batch_size)
+    except LeetCodeThrottled as e:
+        _count('throttled', len(e.usernames))
+        _store(e.results)
+        raise
+    finally:
+        elapsed = time.monotonic() - started
+        with _counters_lock:
+            _counters['fetches'] += 1
+            _counters['fetch_seconds'] += elapsed
+            _counters['max_fetch_seconds'] = max(_counters['max_fetch_seconds'], elapsed)
+
+    _store(results)
+    return results
+
+
+def _revalidate_in_background(usernames):
+    """
+    Refresh stale entries in a background thread. The cache.add lock makes
+    sure only one process revalidates a given username at a time.
+    """
+    claimed = [
+        username for username in usernames
+        if cache.add(REVALIDATE_LOCK_PREFIX + username.lower(), True, 60)
+    ]
+    if not claimed:
+        return
+
+    def revalidate():
+        try:
+            _fetch(claimed)
+        except Exception as e:
+            print(f"Error revalidating LeetCode stats: {str(e)}")
+        finally:
+            cache.delete_many([REVALIDATE_LOCK_PREFIX + username.lower() for username in claimed])
+            # The rate limiter uses the DB from this thread
+            connection.close()
+
+    threading.Thread(target=revalidate, daemon=True).start()
+
+
+def _lookup(entries, usernames, allow_stale):
+    """
+    Split usernames into served results and ones that must be fetched.
+    Returns: (results, to_fetch, stale)
+    """
+    now = time.time()
+    results = {}
+    to_fetch = []
+    stale = []
+
+    for username in usernames:
+        entry = entries.get(_cache_key(username))
+        if entry is None:
+            to_fetch.append(username)
+            continue
+
+        age = now - entry['fetched_at']
+        if entry['stats'] is None:
+            _count('negative_hits')
+            results[username] = None
+        elif age <= settings.LEETCODE_STATS_CACHE_TTL:
+            _count('hits')
+            results[username] = entry['stats']
+        elif allow_stale:
+            _count('stale_hits')
+            results[username] = entry['stats']
+            stale.append(username)
+        else:
+            to_fetch.append(username)
+
+    _count('misses', len(to_fetch))
+    return results, to_fetch, stale
+
+
+def get_cached_stats(username, allow_stale=True, raise_failures=False):
+    """
+    One user's LeetCode stats through the cache (fetched with
+    fetch_stats_batch on a miss).
+
+    Fresh entries are returned directly. Stale entries (older than the TTL but
+    within the grace window) are returned immediately while one background
+    refresh runs. Concurrent misses for the same username in this process wait
+    for a single fetch instead of each hitting LeetCode.
+
+    Returns: dict with easy, medium, hard problem counts or None
+    Raises LeetCodeThrottled if LeetCode is rate limiting us, and
+    LeetCodeUnavailable if `raise_failures` is set and the lookup failed
+    (otherwise a failed lookup returns None like an unknown user)
+    """
+    key = _cache_key(username)
+    entry = cache.get(key)
+
+    results, to_fetch, stale = _lookup({key: entry} if entry else {}, [username], allow_stale)
+    if stale:
+        _revalidate_in_background(stale)
+    if not to_fetch:
+        return results[username]
+
+    with _inflight_lock:
+        lock = _inflight.setdefault(key, threading.Lock())
+
+    with lock:
+        try:
+            # Another thread may have fetched it while we waited
+            entry = cache.get(key)
+            if entry and (entry['stats'] is None or time.time() - entry['fetched_at'] <= settings.LEETCODE_STATS_CACHE_TTL):
+                return entry['stats']
+            stats = _fetch([username]).get(username, FETCH_FAILED)
+            if stats is FETCH_FAILED:
+                if raise_failures:
+                    raise LeetCodeUnavailable(f"Could not fetch LeetCode stats for {username}")
+                return None
+            return stats
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+
+
+def get_cached_stats_batch(usernames, batch_size=None, allow_stale=True):
+    """
+    Many users' LeetCode stats through the cache: one cache round trip for
+    all usernames, then a batched fetch (fetch_stats_batch) for the misses
+    only.
+
+    Returns: dict username -> stats dict, or None for users that failed
+    Raises LeetCodeThrottled (with cached and fetched results) if some
+    usernames could not be fetched because LeetCode is rate limiting us
+    """
+    usernames = list(dict.fromkeys(usernames))
+    entries = cache.get_many([_cache_key(username) for username in usernames])
+
+    results, to_fetch, stale = _lookup(entries, usernames, allow_stale)
+    if stale:
+        _revalidate_in_background(stale)
+    if to_fetch:
+        try:
+            results.update(_fetch(to_fetch, batch_size))
+        except LeetCodeThrottled as e:
+            e.results = failures_to_none({**results, **e.results})
+            raise
+
+    return failures_to_none(results)
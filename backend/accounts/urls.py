@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     RegisterView, changeUsername, changePassword, GoogleAuthCallbackView,
-    get_user_profile, update_leetcode_username
+    get_user_profile, update_leetcode_username, get_leetcode_cache_stats
 )
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -21,4 +21,5 @@ urlpatterns = [
     path("auth/google/", GoogleAuthCallbackView.as_view()),
     path('user/profile/', get_user_profile, name='user_profile'),
     path('user/update-leetcode/', update_leetcode_username, name='update_leetcode'),
+    path('leetcode-cache-stats/', get_leetcode_cache_stats, name='leetcode_cache_stats'),
 ]
\ No newline at end of file
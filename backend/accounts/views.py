@@ -4,12 +4,16 @@ from rest_framework import status
 from .serializer import RegisterSerializer
 from .models import User
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django.conf import settings
+from PrepRot import http_client
 import requests
 from google.oauth2 import id_token
 from google.auth.transport import requests as grequests
 from rest_framework_simplejwt.tokens import RefreshToken
+from .leetcode import LeetCodeThrottled, LeetCodeUnavailable, calculate_leetcode_score
+from .stats_cache import get_cache_counters, get_cached_stats
+from leaderboard.history import record_snapshots
 
 
 class RegisterView(APIView):
@@ -91,7 +95,10 @@ class GoogleAuthCallbackView(APIView):
             "redirect_uri": settings.GOOGLE_OAUTH2_REDIRECT_URI,
             "grant_type": "authorization_code",
         }
-        token_resp = requests.post(settings.GOOGLE_TOKEN_ENDPOINT, data=data)
+        try:
+            token_resp = http_client.post(settings.GOOGLE_TOKEN_ENDPOINT, data=data)
+        except requests.RequestException:
+            return Response({"detail": "Google token endpoint unavailable"}, status=503)
         if token_resp.status_code != 200:
             return Response({"detail": "Failed to get token"}, status=400)
 
@@ -102,7 +109,7 @@ class GoogleAuthCallbackView(APIView):
         try:
             claims = id_token.verify_oauth2_token(
                 id_token_str,
-                grequests.Request(),
+                grequests.Request(session=http_client.get_session()),
                 settings.GOOGLE_OAUTH2_CLIENT_ID
             )
         except ValueError:
@@ -144,63 +151,6 @@ class GoogleAuthCallbackView(APIView):
         })
 
 
-def get_leetcode_stats(username):
-    """
-    Fetch LeetCode stats using GraphQL API
-    Returns: dict with easy, medium, hard problem counts or None if error
-    """
-    url = "https://leetcode.com/graphql"
-    query = """
-    query userProfile($username: String!) {
-      matchedUser(username: $username) {
-        username
-        submitStats {
-          acSubmissionNum {
-            difficulty
-            count
-          }
-        }
-      }
-    }
-    """
-    
-    variables = {"username": username}
-    
-    try:
-        response = requests.post(url, json={"query": query, "variables": variables}, timeout=10)
-        
-        if response.status_code != 200:
-            return None
-            
-        data = response.json()
-        
-        # Check if user exists
-        if not data.get("data") or not data["data"].get("matchedUser"):
-            return None
-            
-        # Extract stats
-        stats = data["data"]["matchedUser"]["submitStats"]["acSubmissionNum"]
-        
-        # Convert to dict for easier access
-        result = {"Easy": 0, "Medium": 0, "Hard": 0}
-        for item in stats:
-            difficulty = item["difficulty"]
-            count = item["count"]
-            if difficulty in result:
-                result[difficulty] = count
-                
-        return result
-        
-    except Exception as e:
-        print(f"Error fetching LeetCode stats for {username}: {str(e)}")
-        return None
-
-def calculate_leetcode_score(easy, medium, hard):
-    """
-    Calculate weighted LeetCode score: Easy×1 + Medium×2 + Hard×3
-    """
-    return (easy * 1) + (medium * 2) + (hard * 3)
-
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_user_profile(request):
@@ -249,7 +199,19 @@ def update_leetcode_username(request):
         )
     
     # Fetch LeetCode stats
-    stats = get_leetcode_stats(leetcode_username)
+    try:
+        stats = get_cached_stats(leetcode_username, raise_failures=True)
+    except LeetCodeThrottled as e:
+        return Response(
+            {'error': 'LeetCode is busy right now. Please try again in a little while.'}, 
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': str(int(e.retry_after) + 1)}
+        )
+    except LeetCodeUnavailable:
+        return Response(
+            {'error': 'Could not reach LeetCode right now. Please try again in a little while.'}, 
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
     if not stats:
         return Response(
             {'error': 'Could not fetch stats for this LeetCode username. Please check if the username is correct.'}, 
@@ -264,7 +226,8 @@ def update_leetcode_username(request):
     user.leetcode_username = leetcode_username
     user.college = college
     user.leetcode_score = new_score
-    user.save()
+    user.save()  # the leaderboard signals sync the user's boards
+    record_snapshots([(user, stats)])
     
     return Response({
         'message': 'Profile updated successfully',
@@ -272,4 +235,14 @@ def update_leetcode_username(request):
         'college': college,
         'leetcode_score': new_score,
         'stats': stats
-    })
\ No newline at end of file
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def get_leetcode_cache_stats(request):
+    """
+    LeetCode stats cache counters of the web process serving this request
+    (staff only). Refresh jobs record their own counters on the job.
+    """
+    return Response(get_cache_counters())
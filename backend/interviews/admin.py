@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MockInterview, InterviewExperience, ReferralProfile
+from .models import MockInterview, InterviewExperience, ReferralProfile, ExperienceRollup, ReferralRollup
 
 
 @admin.register(MockInterview)
@@ -71,4 +71,18 @@ class ReferralProfileAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(ExperienceRollup)
+class ExperienceRollupAdmin(admin.ModelAdmin):
+    list_display = ('company', 'role', 'dimension', 'value', 'count', 'difficulty_sum')
+    list_filter = ('dimension',)
+    search_fields = ('company', 'role', 'value')
+
+
+@admin.register(ReferralRollup)
+class ReferralRollupAdmin(admin.ModelAdmin):
+    list_display = ('preferred_company', 'dimension', 'value', 'count')
+    list_filter = ('dimension',)
+    search_fields = ('preferred_company', 'value')
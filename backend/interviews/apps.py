@@ -1,6 +1,30 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+
+
+def install_experience_search(sender, using, **kwargs):
+    from django.db import connections
+    from .search import install_search_index
+    install_search_index(connections[using])
+
+
+def fill_empty_rollups(sender, **kwargs):
+    from .rollups import rebuild_if_empty
+    rebuild_if_empty()
 
 
 class InterviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'interviews'
+
+    def ready(self):
+        from . import rollups
+
+        post_migrate.connect(install_experience_search, sender=self)
+        post_migrate.connect(fill_empty_rollups, sender=self)
+        pre_save.connect(rollups.experience_pre_save, sender='interviews.InterviewExperience')
+        post_save.connect(rollups.experience_saved, sender='interviews.InterviewExperience')
+        post_delete.connect(rollups.experience_deleted, sender='interviews.InterviewExperience')
+        pre_save.connect(rollups.referral_pre_save, sender='interviews.ReferralProfile')
+        post_save.connect(rollups.referral_saved, sender='interviews.ReferralProfile')
+        post_delete.connect(rollups.referral_deleted, sender='interviews.ReferralProfile')
@@ -0,0 +1,31 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from interviews.models import MockInterview
+
+CHUNK_SIZE = 1000
+
+class Command(BaseCommand):
+    help = 'Set MockInterview.end_time on interviews created before it was stored'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        updated = 0
+        
+        while True:
+            chunk = list(
+                MockInterview.objects.filter(end_time__isnull=True)
+                .order_by('id').only('id', 'scheduled_time', 'duration_minutes')[:CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            for interview in chunk:
+                interview.end_time = interview.scheduled_time + timedelta(minutes=interview.duration_minutes)
+            MockInterview.objects.bulk_update(chunk, ['end_time'])
+            updated += len(chunk)
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Set end times on {updated} interviews in {time.monotonic() - started:.2f}s"
+            )
+        )
@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from interviews.models import InterviewExperience
+from interviews.search import rebuild_search_index
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for interview experiences'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write(
+                self.style.WARNING("⚠️ Full-text search index is only used with SQLite, nothing to do")
+            )
+            return
+        
+        started = time.monotonic()
+        rebuild_search_index()
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Indexed {InterviewExperience.objects.count()} experiences in {time.monotonic() - started:.2f}s"
+            )
+        )
@@ -0,0 +1,18 @@
+import time
+from django.core.management.base import BaseCommand
+from interviews.rollups import rebuild_rollups
+
+class Command(BaseCommand):
+    help = 'Recompute the experience and referral stats rollups from scratch'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        experience_rows, referral_rows = rebuild_rollups()
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Rebuilt rollups in {time.monotonic() - started:.2f}s"
+            )
+        )
+        self.stdout.write(f"   📝 Experience rollup rows: {experience_rows}")
+        self.stdout.write(f"   🤝 Referral rollup rows: {referral_rows}")
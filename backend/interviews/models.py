@@ -1,3 +1,4 @@
+from datetime import timedelta
 from django.db import models
 from django.conf import settings
 
@@ -32,6 +33,7 @@ class MockInterview(models.Model):
     )
     scheduled_time = models.DateTimeField()
     duration_minutes = models.PositiveIntegerField(default=60, help_text="Interview duration in minutes")
+    end_time = models.DateTimeField(null=True, editable=False, help_text="scheduled_time + duration_minutes, set on save")
     interview_type = models.CharField(max_length=20, choices=INTERVIEW_TYPE_CHOICES, default='technical')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='scheduled')
     meeting_link = models.URLField(blank=True, help_text="Video call link")
@@ -44,6 +46,20 @@ class MockInterview(models.Model):
     
     class Meta:
         ordering = ['-scheduled_time']
+        indexes = [
+            # Overlap checks and free-slot search scan one participant's interviews by start time
+            models.Index(fields=['interviewer', 'scheduled_time', 'end_time']),
+            models.Index(fields=['interviewee', 'scheduled_time', 'end_time']),
+            # Free-slot search loads every interview in a time window
+            models.Index(fields=['scheduled_time', 'end_time']),
+        ]
+    
+    def save(self, *args, **kwargs):
+        self.end_time = self.scheduled_time + timedelta(minutes=self.duration_minutes)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'scheduled_time', 'duration_minutes'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'end_time'}
+        super().save(*args, **kwargs)
     
     def __str__(self):
         return f"Interview: {self.interviewer.username} -> {self.interviewee.username} ({self.scheduled_time.strftime('%Y-%m-%d %H:%M')})"
@@ -81,6 +97,10 @@ class InterviewExperience(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the experiences feed
+            models.Index(fields=['-created_at', '-id']),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.company} ({self.role}) - {self.experience_type}"
@@ -109,4 +129,48 @@ class ReferralProfile(models.Model):
     updated_at = models.DateTimeField(auto_now=True, null=True)
     
     def __str__(self):
-        return f"{self.user.username}'s Referral Profile - {self.preferred_company}"
\ No newline at end of file
+        return f"{self.user.username}'s Referral Profile - {self.preferred_company}"
+
+
+class ExperienceRollup(models.Model):
+    """
+    Experience counts per dimension value, maintained by interviews.rollups.
+    Each row is scoped to a company and/or role ('' = all of them) so the
+    drill-downs read a handful of rows instead of aggregating experiences.
+    """
+    company = models.CharField(max_length=100, blank=True)
+    role = models.CharField(max_length=100, blank=True)
+    dimension = models.CharField(max_length=20)  # total, company, role, outcome, experience_type, month
+    value = models.CharField(max_length=100, blank=True)
+    count = models.IntegerField(default=0)
+    difficulty_sum = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['company', 'role', 'dimension', 'value']
+        indexes = [
+            # Top companies/roles of a scope
+            models.Index(fields=['company', 'role', 'dimension', '-count']),
+        ]
+    
+    def __str__(self):
+        return f"{self.company or '*'}/{self.role or '*'} {self.dimension}={self.value}: {self.count}"
+
+
+class ReferralRollup(models.Model):
+    """
+    Referral profile counts per dimension value, maintained by
+    interviews.rollups, scoped to a preferred company ('' = all of them)
+    """
+    preferred_company = models.CharField(max_length=100, blank=True)
+    dimension = models.CharField(max_length=20)  # total, company, status
+    value = models.CharField(max_length=100, blank=True)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['preferred_company', 'dimension', 'value']
+        indexes = [
+            models.Index(fields=['preferred_company', 'dimension', '-count']),
+        ]
+    
+    def __str__(self):
+        return f"{self.preferred_company or '*'} {self.dimension}={self.value}: {self.count}"
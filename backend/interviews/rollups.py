@@ -0,0 +1,304 @@
+"""
+Rollup tables behind the experience and referral stats endpoints.
+
+Each rollup row counts one dimension value (an outcome, a month, a
+company, ...) within a scope: all experiences, one company, one role or
+one (company, role) pair; '' in the company/role columns means "all". An
+InterviewExperience therefore touches about twenty ExperienceRollup rows
+and a ReferralProfile five ReferralRollup rows, and every stats read is
+an index lookup on its scope: a few rows per dimension plus a top-10 by
+count, however many experiences or distinct companies there are.
+
+Model signals move a row's contribution when it is created, edited or
+deleted; bulk writes bypass them, so run rebuild_interview_rollups
+afterwards. migrate fills empty rollup tables from existing rows (see
+rebuild_if_empty).
+"""
+from collections import Counter
+from datetime import date
+from functools import reduce
+from operator import or_
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+from .models import ExperienceRollup, InterviewExperience, ReferralProfile, ReferralRollup
+
+ALL = ''
+EXPERIENCE_FIELDS = ['company', 'role', 'dimension', 'value']
+REFERRAL_FIELDS = ['preferred_company', 'dimension', 'value']
+# Dimensions read in full for a scope; company and role are read top-N
+BREAKDOWN_DIMENSIONS = ['total', 'outcome', 'experience_type', 'month']
+
+
+def experience_facts(experience):
+    """
+    The attributes an experience is counted under:
+    (company, role, month 'YYYY-MM', experience_type, outcome)
+    """
+    interview_date = experience.date
+    if isinstance(interview_date, str):
+        interview_date = date.fromisoformat(interview_date)
+    return (
+        experience.company,
+        experience.role,
+        f"{interview_date:%Y-%m}",
+        experience.experience_type,
+        experience.outcome
+    )
+
+
+def experience_keys(facts):
+    """
+    Every ExperienceRollup key (company, role, dimension, value) an
+    experience with `facts` counts towards
+    """
+    company, role, month, experience_type, outcome = facts
+    keys = []
+    for scope_company, scope_role in ((ALL, ALL), (company, ALL), (ALL, role), (company, role)):
+        keys += [
+            (scope_company, scope_role, 'total', ''),
+            (scope_company, scope_role, 'outcome', outcome),
+            (scope_company, scope_role, 'experience_type', experience_type),
+            (scope_company, scope_role, 'month', month),
+        ]
+        if scope_company == ALL:
+            keys.append((scope_company, scope_role, 'company', company))
+        if scope_role == ALL:
+            keys.append((scope_company, scope_role, 'role', role))
+    return keys
+
+
+def referral_keys(facts):
+    """
+    Every ReferralRollup key (preferred_company, dimension, value) a
+    profile with facts (preferred_company, status) counts towards
+    """
+    preferred_company, profile_status = facts
+    return [
+        (ALL, 'total', ''),
+        (ALL, 'status', profile_status),
+        (ALL, 'company', preferred_company),
+        (preferred_company, 'total', ''),
+        (preferred_company, 'status', profile_status),
+    ]
+
+
+def _apply(model, fields, keys, **deltas):
+    """
+    Add `deltas` to the rollup rows at `keys`, creating missing ones first.
+    Two queries however many keys there are.
+    """
+    lookups = [dict(zip(fields, key)) for key in keys]
+    model.objects.bulk_create([model(**lookup) for lookup in lookups], ignore_conflicts=True)
+    model.objects.filter(reduce(or_, (Q(**lookup) for lookup in lookups))).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+
+
+# Signal receivers
+
+def experience_pre_save(sender, instance, raw=False, **kwargs):
+    # Remember the contribution the row had before this save
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        previous = InterviewExperience.objects.filter(pk=instance.pk).values(
+            'company', 'role', 'date', 'experience_type', 'outcome', 'difficulty_rating'
+        ).first()
+        if previous:
+            instance._rollup_previous = (
+                experience_facts(InterviewExperience(**previous)),
+                previous['difficulty_rating']
+            )
+
+
+def experience_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    current = (experience_facts(instance), int(instance.difficulty_rating))
+    if previous == current:
+        return
+
+    with transaction.atomic():
+        if previous:
+            _apply(
+                ExperienceRollup, EXPERIENCE_FIELDS, experience_keys(previous[0]),
+                count=-1, difficulty_sum=-previous[1]
+            )
+        _apply(ExperienceRollup, EXPERIENCE_FIELDS, experience_keys(current[0]), count=1, difficulty_sum=current[1])
+
+
+def experience_deleted(sender, instance, **kwargs):
+    _apply(
+        ExperienceRollup, EXPERIENCE_FIELDS, experience_keys(experience_facts(instance)),
+        count=-1, difficulty_sum=-int(instance.difficulty_rating)
+    )
+
+
+def referral_pre_save(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        instance._rollup_previous = ReferralProfile.objects.filter(pk=instance.pk).values_list(
+            'preferred_company', 'status'
+        ).first()
+
+
+def referral_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', None)
+    current = (instance.preferred_company, instance.status)
+    if previous == current:
+        return
+
+    with transaction.atomic():
+        if previous:
+            _apply(ReferralRollup, REFERRAL_FIELDS, referral_keys(previous), count=-1)
+        _apply(ReferralRollup, REFERRAL_FIELDS, referral_keys(current), count=1)
+
+
+def referral_deleted(sender, instance, **kwargs):
+    _apply(ReferralRollup, REFERRAL_FIELDS, referral_keys((instance.preferred_company, instance.status)), count=-1)
+
+
+# Rebuild
+
+def _insert(model, columns, rows):
+    # executemany skips per-row model instantiation; a rebuild writes
+    # several rollup rows per experience
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(map(connection.ops.quote_name, columns))}) "
+            f"VALUES ({', '.join(['%s'] * len(columns))})",
+            list(rows)
+        )
+
+
+@transaction.atomic
+def rebuild_rollups():
+    """
+    Recompute both rollup tables from scratch, one GROUP BY pass over each
+    source table.
+    Returns: (experience rollup rows, referral rollup rows)
+    """
+    counts = Counter()
+    difficulty = Counter()
+    groups = InterviewExperience.objects.annotate(month=TruncMonth('date')).values_list(
+        'company', 'role', 'month', 'experience_type', 'outcome'
+    ).annotate(count=Count('id'), difficulty_sum=Sum('difficulty_rating')).order_by()
+    for company, role, month, experience_type, outcome, count, difficulty_sum in groups.iterator():
+        for key in experience_keys((company, role, f"{month:%Y-%m}", experience_type, outcome)):
+            counts[key] += count
+            difficulty[key] += difficulty_sum
+
+    ExperienceRollup.objects.all().delete()
+    _insert(
+        ExperienceRollup, [*EXPERIENCE_FIELDS, 'count', 'difficulty_sum'],
+        ((*key, count, difficulty[key]) for key, count in counts.items())
+    )
+
+    referral_counts = Counter()
+    for group in ReferralProfile.objects.values('preferred_company', 'status').annotate(count=Count('id')).order_by():
+        for key in referral_keys((group['preferred_company'], group['status'])):
+            referral_counts[key] += group['count']
+
+    ReferralRollup.objects.all().delete()
+    _insert(ReferralRollup, [*REFERRAL_FIELDS, 'count'], ((*key, count) for key, count in referral_counts.items()))
+
+    return len(counts), len(referral_counts)
+
+
+def rebuild_if_empty():
+    """
+    Rebuild the rollups when a rollup table is empty but its source table
+    is not, as on an existing database the first time it is migrated.
+    Returns: what rebuild_rollups returns, or None if nothing was missing
+    """
+    if (
+        (InterviewExperience.objects.exists() and not ExperienceRollup.objects.exists())
+        or (ReferralProfile.objects.exists() and not ReferralRollup.objects.exists())
+    ):
+        return rebuild_rollups()
+    return None
+
+
+# Reads
+
+def _top(rows, dimension, name, limit=10):
+    # Highest count first, ties by name so the output is stable
+    ranked = rows.filter(dimension=dimension).order_by('-count', 'value').values_list('value', 'count')[:limit]
+    return [{name: value, 'count': count} for value, count in ranked]
+
+
+def experience_stats(company=None, role=None):
+    """
+    Experience statistics from the rollup, optionally drilled down to one
+    company and/or role (exact match). Three index lookups on the scope's
+    rollup rows.
+    """
+    rows = ExperienceRollup.objects.filter(company=company or ALL, role=role or ALL, count__gt=0)
+
+    total = 0
+    difficulty_sum = 0
+    breakdown = {dimension: {} for dimension in BREAKDOWN_DIMENSIONS}
+    for dimension, value, count, dimension_difficulty in rows.filter(
+        dimension__in=BREAKDOWN_DIMENSIONS
+    ).values_list('dimension', 'value', 'count', 'difficulty_sum'):
+        if dimension == 'total':
+            total, difficulty_sum = count, dimension_difficulty
+        else:
+            breakdown[dimension][value] = count
+
+    # Within a company (or role) scope there is only that one company (or role)
+    if company:
+        top_companies = [{'company': company, 'count': total}] if total else []
+    else:
+        top_companies = _top(rows, 'company', 'company')
+    if role:
+        top_roles = [{'role': role, 'count': total}] if total else []
+    else:
+        top_roles = _top(rows, 'role', 'role')
+
+    return {
+        'total_experiences': total,
+        'experience_types': [
+            {'experience_type': key, 'count': count} for key, count in sorted(breakdown['experience_type'].items())
+        ],
+        'top_companies': top_companies,
+        'top_roles': top_roles,
+        'average_difficulty': round(difficulty_sum / total, 1) if total else 0,
+        'outcomes': [{'outcome': key, 'count': count} for key, count in sorted(breakdown['outcome'].items())],
+        'months': [
+            {'month': date.fromisoformat(f"{key}-01"), 'count': count} for key, count in sorted(breakdown['month'].items())
+        ]
+    }
+
+
+def referral_stats(company=None):
+    """
+    Referral profile statistics from the rollup, optionally for one
+    preferred company. At most two index lookups on the scope's rollup rows.
+    """
+    rows = ReferralRollup.objects.filter(preferred_company=company or ALL, count__gt=0)
+
+    total = 0
+    statuses = {}
+    for dimension, value, count in rows.filter(dimension__in=['total', 'status']).values_list('dimension', 'value', 'count'):
+        if dimension == 'total':
+            total = count
+        else:
+            statuses[value] = count
+
+    if company:
+        top_companies = [{'preferred_company': company, 'count': total}] if total else []
+    else:
+        top_companies = _top(rows, 'company', 'preferred_company')
+
+    return {
+        'total_profiles': total,
+        'active_profiles': statuses.get('active', 0),
+        'hired_profiles': statuses.get('hired', 0),
+        'top_companies': top_companies,
+        'statuses': [{'status': key, 'count': count} for key, count in sorted(statuses.items())]
+    }
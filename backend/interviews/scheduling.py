@@ -0,0 +1,270 @@
+"""
+Mock interview booking on (participant, start, end) intervals.
+
+An interview occupies [scheduled_time, end_time) on the calendars of both
+its interviewer and its interviewee, whichever side of the call they are
+on. Two interviews conflict when their intervals overlap; back-to-back
+interviews do not. Lookups go through the (interviewer|interviewee,
+scheduled_time, end_time) indexes: no interview is longer than
+MOCK_INTERVIEW_MAX_DURATION, so only starts within that distance before
+the window can overlap it and the scan stays a short index range.
+Interviews booked before end_time was stored have it NULL; they are
+fetched as candidates and their end is computed from duration_minutes (see
+interview_end) until backfill_interview_end_times fills the column.
+
+find_free_slots answers the reverse question: the earliest intervals
+where an interviewer and the requester are both free.
+"""
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+from .models import MockInterview
+
+User = get_user_model()
+
+ACTIVE_STATUSES = ['scheduled', 'in_progress']
+
+
+class BookingConflict(Exception):
+    """
+    The requested interval overlaps an active interview of `participant`
+    ('interviewer' or 'interviewee')
+    """
+
+    def __init__(self, participant, interview_id):
+        self.participant = participant
+        self.interview_id = interview_id
+        super().__init__(f"The {participant} already has interview {interview_id} at this time")
+
+
+def max_duration():
+    return timedelta(minutes=settings.MOCK_INTERVIEW_MAX_DURATION)
+
+
+def interview_end(scheduled_time, end_time, duration_minutes):
+    """
+    An interview's end: end_time, or scheduled_time + duration_minutes for
+    rows saved before end_time was stored
+    """
+    if end_time is None:
+        return scheduled_time + timedelta(minutes=duration_minutes)
+    return end_time
+
+
+def busy_intervals(user_ids, start, end):
+    """
+    Active interviews of any of `user_ids` (as interviewer or interviewee)
+    overlapping [start, end), plus those with a NULL end_time starting in
+    the same range; check those with interview_end
+    """
+    window = Q(scheduled_time__gt=start - max_duration(), scheduled_time__lt=end) & (
+        Q(end_time__gt=start) | Q(end_time__isnull=True)
+    )
+    return MockInterview.objects.filter(
+        window,
+        Q(interviewer_id__in=user_ids) | Q(interviewee_id__in=user_ids),
+        status__in=ACTIVE_STATUSES
+    )
+
+
+def find_conflict(interviewer_id, interviewee_id, start, end, exclude_id=None):
+    """
+    Returns: (participant, interview id) of the earliest clashing interview,
+    or None if both calendars are free for [start, end)
+    """
+    clashes = busy_intervals([interviewer_id, interviewee_id], start, end)
+    if exclude_id is not None:
+        clashes = clashes.exclude(id=exclude_id)
+
+    clash = next(
+        (
+            clash for clash in clashes.order_by('scheduled_time', 'id').values(
+                'id', 'interviewer_id', 'interviewee_id', 'scheduled_time', 'end_time', 'duration_minutes'
+            )
+            if interview_end(clash['scheduled_time'], clash['end_time'], clash['duration_minutes']) > start
+        ),
+        None
+    )
+    if clash is None:
+        return None
+    participant = 'interviewer' if interviewer_id in (clash['interviewer_id'], clash['interviewee_id']) else 'interviewee'
+    return participant, clash['id']
+
+
+def _lock_participants(user_ids):
+    """
+    Serialize bookings that share a participant. Row locks on the two user
+    rows (taken in id order so concurrent bookings cannot deadlock) let
+    bookings for other people proceed in parallel. SQLite has no row locks;
+    there the transaction takes the database write lock when it starts
+    (transaction_mode IMMEDIATE), and the check after the insert sees every
+    booking committed before ours.
+    """
+    if connection.features.has_select_for_update:
+        list(User.objects.select_for_update().filter(id__in=user_ids).order_by('id').values_list('id', flat=True))
+
+
+def book_interview(interviewer, interviewee, scheduled_time, duration_minutes, **fields):
+    """
+    Create a MockInterview unless it overlaps an active interview of either
+    participant.
+
+    The overlap check runs after the insert, inside the same transaction and
+    under the participants' locks, so two concurrent requests for
+    overlapping slots cannot both succeed.
+
+    Returns: the new MockInterview
+    Raises BookingConflict (nothing is written) if the slot is taken
+    """
+    with transaction.atomic():
+        _lock_participants([interviewer.id, interviewee.id])
+        interview = MockInterview.objects.create(
+            interviewer=interviewer,
+            interviewee=interviewee,
+            scheduled_time=scheduled_time,
+            duration_minutes=duration_minutes,
+            **fields
+        )
+        conflict = find_conflict(
+            interviewer.id, interviewee.id, interview.scheduled_time, interview.end_time,
+            exclude_id=interview.id
+        )
+        if conflict:
+            # Leaving the block with an exception rolls the insert back
+            raise BookingConflict(*conflict)
+
+    return interview
+
+
+# Free-slot search
+
+def _window_rows(start, end):
+    """
+    (interviewer_id, interviewee_id, start, end) of every active interview
+    overlapping [start, end) (epoch seconds), in one range query on the
+    start-time index
+    """
+    window_start = datetime.fromtimestamp(start, timezone.utc)
+    rows = MockInterview.objects.filter(
+        Q(end_time__gt=window_start) | Q(end_time__isnull=True),
+        scheduled_time__gt=window_start - max_duration(),
+        scheduled_time__lt=datetime.fromtimestamp(end, timezone.utc),
+        status__in=ACTIVE_STATUSES
+    ).order_by().values_list('interviewer_id', 'interviewee_id', 'scheduled_time', 'end_time', 'duration_minutes')
+    busy = []
+    for interviewer_id, interviewee_id, scheduled_time, end_time, duration_minutes in rows:
+        busy_end = int(interview_end(scheduled_time, end_time, duration_minutes).timestamp())
+        if busy_end > start:
+            busy.append((interviewer_id, interviewee_id, int(scheduled_time.timestamp()), busy_end))
+    return busy
+
+
+def _gap_starts(busy, window_start, window_end, last_start, duration, step):
+    """
+    Sweep the start-sorted busy intervals and yield, in order, every start
+    before `last_start` on the `step` grid whose [start, start + duration)
+    fits in a gap of [window_start, window_end)
+    """
+    cursor = window_start
+    for busy_start, busy_end in busy:
+        if busy_start > cursor:
+            slot = -(-cursor // step) * step
+            while slot < last_start and slot + duration <= min(busy_start, window_end):
+                yield slot
+                slot += step
+        cursor = max(cursor, busy_end)
+        if cursor >= min(window_end, last_start):
+            return
+
+    slot = -(-cursor // step) * step
+    while slot < last_start and slot + duration <= window_end:
+        yield slot
+        slot += step
+
+
+def _interviewer_slots(interviewer_id, *args):
+    for slot in _gap_starts(*args):
+        yield slot, interviewer_id
+
+
+def _chunk_slots(requester_id, interviewers, chunk_start, chunk_end, window_end, duration, step, limit):
+    """
+    Earliest `limit` (start, interviewer id) pairs starting in
+    [chunk_start, chunk_end). Interviews up to one duration past the chunk
+    are loaded so slots near its end are checked in full.
+    """
+    lookahead = min(chunk_end + duration, window_end)
+
+    busy = defaultdict(list)
+    own = []
+    for interviewer_id, interviewee_id, busy_start, busy_end in _window_rows(chunk_start, lookahead):
+        for user_id in {interviewer_id, interviewee_id}:
+            if user_id == requester_id:
+                own.append((busy_start, busy_end))
+            elif user_id in interviewers:
+                busy[user_id].append((busy_start, busy_end))
+    own.sort()
+
+    streams = [
+        _interviewer_slots(
+            interviewer_id,
+            list(heapq.merge(sorted(busy[interviewer_id]), own)) if interviewer_id in busy else own,
+            chunk_start, lookahead, chunk_end, duration, step
+        )
+        for interviewer_id in interviewers
+        if interviewer_id != requester_id
+    ]
+    return list(islice(heapq.merge(*streams), limit))
+
+
+def find_free_slots(requester_id, interviewers, start, end, duration_minutes, limit, step_minutes=None):
+    """
+    Earliest free slots in [start, end) across `interviewers` (dict id ->
+    username) for an interview of `duration_minutes` booked by
+    `requester_id`.
+
+    The window is scanned in chunks of one day, doubling each time, and
+    the scan stops once `limit` slots are found, so a search that fills
+    up early never loads the rest of a multi-week window. Each chunk's
+    interviews come from one range query and are split into
+    per-participant busy lists. The requester's own interviews are merged
+    into every interviewer's list, since both calendars must be free. Each
+    list is swept once for its gaps, lazily in start order, and
+    heapq.merge picks the earliest slots across all interviewers.
+
+    Slot starts are aligned to `step_minutes` (MOCK_INTERVIEW_SLOT_STEP by
+    default) and never in the past.
+
+    Returns: list of dicts with start, end and interviewer (id, username)
+    """
+    if step_minutes is None:
+        step_minutes = settings.MOCK_INTERVIEW_SLOT_STEP
+    step = step_minutes * 60
+    duration = duration_minutes * 60
+    window_start = int(max(start, datetime.now(timezone.utc)).timestamp())
+    window_end = int(end.timestamp())
+
+    found = []
+    chunk_start = window_start
+    span = 24 * 3600
+    while chunk_start < window_end and len(found) < limit:
+        chunk_end = min(chunk_start + span, window_end)
+        found += _chunk_slots(
+            requester_id, interviewers, chunk_start, chunk_end, window_end, duration, step, limit - len(found)
+        )
+        chunk_start = chunk_end
+        span *= 2
+
+    return [
+        {
+            'start': datetime.fromtimestamp(slot, timezone.utc),
+            'end': datetime.fromtimestamp(slot + duration, timezone.utc),
+            'interviewer': {'id': interviewer_id, 'username': interviewers[interviewer_id]}
+        }
+        for slot, interviewer_id in found
+    ]
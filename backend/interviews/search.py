@@ -0,0 +1,101 @@
+from django.db import connection
+from problems.search import build_match_query
+
+FTS_TABLE = 'interviews_experience_fts'
+SEARCH_COLUMNS = ['company', 'role', 'round_details', 'overall_feedback', 'tips_and_advice']
+
+_columns = ', '.join(SEARCH_COLUMNS)
+_new_values = ', '.join(f'new.{column}' for column in SEARCH_COLUMNS)
+_old_values = ', '.join(f'old.{column}' for column in SEARCH_COLUMNS)
+
+# External-content FTS5 index over the text fields of InterviewExperience.
+# Triggers keep it in sync on create, update and delete.
+INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns},
+        content='interviews_interviewexperience',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON interviews_interviewexperience BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns})
+        VALUES (new.id, {_new_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON interviews_interviewexperience BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns})
+        VALUES ('delete', old.id, {_old_values});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON interviews_interviewexperience BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns})
+        VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns})
+        VALUES (new.id, {_new_values});
+    END
+    """,
+    # bm25 column weights: company and role matches outrank matches in the long text
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', 'bm25(5.0, 3.0, 1.0, 1.0, 1.0)')",
+]
+
+MATCH_SQL = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+# ORDER BY rank uses the bm25 weights configured in INSTALL_SQL and lets FTS5
+# stop after LIMIT rows, so snippets are only built for the rows returned.
+# Snippets are the best matching fragment of any column, matched terms in <mark>.
+RANK_SQL = (
+    f"SELECT rowid, snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 16) "
+    f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s OFFSET %s"
+)
+
+
+def search_available(using=connection):
+    """
+    Full-text search needs SQLite with FTS5; other backends fall back to LIKE
+    """
+    return using.vendor == 'sqlite' and FTS_TABLE in using.introspection.table_names()
+
+
+def install_search_index(using=connection):
+    """
+    Create the FTS5 table and its sync triggers if they do not exist yet,
+    indexing any experiences that were already in the table
+    """
+    if using.vendor != 'sqlite':
+        return False
+    created = FTS_TABLE not in using.introspection.table_names()
+    with using.cursor() as cursor:
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+        if created:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def rebuild_search_index(using=connection):
+    """
+    Re-index every experience from scratch
+    """
+    install_search_index(using)
+    with using.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def search_experiences(search, limit=None, offset=0):
+    """
+    Experiences matching `search`, best match first, optionally one slice of
+    the ranking
+    Returns: list of (experience id, highlighted snippet)
+    """
+    match = build_match_query(search)
+    if match is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(RANK_SQL, [match, -1 if limit is None else limit, offset])
+        return cursor.fetchall()
@@ -1,3 +1,110 @@
+import random
+from datetime import timedelta
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+from .models import MockInterview
+from .scheduling import ACTIVE_STATUSES, BookingConflict, book_interview, find_free_slots
 
-# Create your tests here.
+User = get_user_model()
+
+
+def _window_start():
+    # A whole hour tomorrow, so the slot grid starts at the window start
+    return (timezone.now() + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
+
+
+class BookingTests(TestCase):
+    def setUp(self):
+        self.interviewer = User.objects.create(username='interviewer', email='interviewer@example.com')
+        self.interviewee = User.objects.create(username='interviewee', email='interviewee@example.com')
+        self.other = User.objects.create(username='other', email='other@example.com')
+        self.start = _window_start()
+        self.booked = book_interview(self.interviewer, self.interviewee, self.start, 60)
+
+    def test_overlap_is_rejected(self):
+        with self.assertRaises(BookingConflict) as raised:
+            book_interview(self.other, self.interviewer, self.start + timedelta(minutes=30), 60)
+        self.assertEqual(raised.exception.participant, 'interviewee')
+        self.assertEqual(raised.exception.interview_id, self.booked.id)
+        self.assertEqual(MockInterview.objects.count(), 1)
+
+    def test_back_to_back_is_allowed(self):
+        book_interview(self.interviewer, self.other, self.start + timedelta(minutes=60), 30)
+        book_interview(self.other, self.interviewee, self.start - timedelta(minutes=30), 30)
+        self.assertEqual(MockInterview.objects.count(), 3)
+
+    def test_interview_without_end_time_still_blocks(self):
+        # Interviews saved before end_time was stored have it NULL
+        MockInterview.objects.update(end_time=None)
+        with self.assertRaises(BookingConflict):
+            book_interview(self.interviewer, self.other, self.start + timedelta(minutes=45), 30)
+
+
+class FreeSlotSearchTests(TestCase):
+    """
+    find_free_slots against a naive scan of every step in the window
+    """
+    step = 15
+
+    def setUp(self):
+        self.random = random.Random(25)
+        self.requester = User.objects.create(username='requester', email='requester@example.com')
+        self.interviewers = {
+            user.id: user.username
+            for user in (User.objects.create(username=f'user{i}', email=f'user{i}@example.com') for i in range(5))
+        }
+        self.start = _window_start()
+        self.end = self.start + timedelta(days=3)
+
+    def _random_calendar(self, count):
+        people = [self.requester.id, *self.interviewers]
+        for _ in range(count):
+            interviewer_id, interviewee_id = self.random.sample(people, 2)
+            MockInterview.objects.create(
+                interviewer_id=interviewer_id,
+                interviewee_id=interviewee_id,
+                scheduled_time=self.start + timedelta(minutes=5 * self.random.randrange(-48, 12 * 24 * 3)),
+                duration_minutes=self.random.choice([30, 45, 60, 90, 240]),
+                status=self.random.choice(['scheduled', 'scheduled', 'in_progress', 'cancelled'])
+            )
+
+    def _naive_slots(self, duration_minutes):
+        busy = [
+            (interview.scheduled_time, interview.end_time, {interview.interviewer_id, interview.interviewee_id})
+            for interview in MockInterview.objects.filter(status__in=ACTIVE_STATUSES)
+        ]
+        slots = []
+        slot = self.start
+        while slot + timedelta(minutes=duration_minutes) <= self.end:
+            slot_end = slot + timedelta(minutes=duration_minutes)
+            for interviewer_id in sorted(self.interviewers):
+                if not any(
+                    busy_start < slot_end and busy_end > slot and {interviewer_id, self.requester.id} & people
+                    for busy_start, busy_end, people in busy
+                ):
+                    slots.append((slot, interviewer_id))
+            slot += timedelta(minutes=self.step)
+        return slots
+
+    def _found_slots(self, duration_minutes, limit):
+        return [
+            (slot['start'], slot['interviewer']['id'])
+            for slot in find_free_slots(
+                self.requester.id, self.interviewers, self.start, self.end, duration_minutes, limit,
+                step_minutes=self.step
+            )
+        ]
+
+    def test_matches_naive_scan(self):
+        for count in (80, 250):
+            MockInterview.objects.all().delete()
+            self._random_calendar(count)
+            for duration_minutes in (45, 120):
+                expected = self._naive_slots(duration_minutes)
+                self.assertEqual(self._found_slots(duration_minutes, len(expected) + 1), expected)
+
+    def test_limit_returns_earliest(self):
+        self._random_calendar(200)
+        expected = self._naive_slots(60)
+        self.assertEqual(self._found_slots(60, 10), expected[:10])
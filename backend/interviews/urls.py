@@ -5,6 +5,7 @@ from .views import (
     delete_referral_profile,
     get_referral_stats,
     get_interview_experiences,
+    get_interview_experience,
     create_interview_experience,
     get_my_interview_experiences,
     update_interview_experience,
@@ -13,6 +14,7 @@ from .views import (
     get_mock_interviews,
     create_mock_interview,
     get_available_interviewers,
+    get_free_slots,
     update_mock_interview,
     cancel_mock_interview,
     get_interview_stats
@@ -27,6 +29,7 @@ urlpatterns = [
     
     # Interview Experience URLs
     path('experiences/', get_interview_experiences, name='get_interview_experiences'),
+    path('experiences/<int:experience_id>/', get_interview_experience, name='get_interview_experience'),
     path('experiences/create/', create_interview_experience, name='create_interview_experience'),
     path('experiences/my/', get_my_interview_experiences, name='get_my_interview_experiences'),
     path('experiences/<int:experience_id>/update/', update_interview_experience, name='update_interview_experience'),
@@ -37,6 +40,7 @@ urlpatterns = [
     path('mock-interviews/', get_mock_interviews, name='get_mock_interviews'),
     path('mock-interviews/create/', create_mock_interview, name='create_mock_interview'),
     path('mock-interviews/interviewers/', get_available_interviewers, name='get_available_interviewers'),
+    path('mock-interviews/slots/', get_free_slots, name='get_free_slots'),
     path('mock-interviews/<int:interview_id>/update/', update_mock_interview, name='update_mock_interview'),
     path('mock-interviews/<int:interview_id>/cancel/', cancel_mock_interview, name='cancel_mock_interview'),
     path('mock-interviews/stats/', get_interview_stats, name='get_interview_stats'),
@@ -3,9 +3,17 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q, Count, Avg
+from django.db.models import F, Q, Avg
+from django.db.models.expressions import RawSQL
+from django.core.exceptions import ValidationError
+from PrepRot.pagination import encode_cursor, decode_cursor, parse_limit
+from problems.search import build_match_query
 from .models import ReferralProfile, InterviewExperience, MockInterview
+from .rollups import experience_stats, referral_stats
+from .scheduling import BookingConflict, book_interview, find_free_slots
+from .search import MATCH_SQL, search_available, search_experiences
 from datetime import datetime, timedelta
 from django.utils import timezone
 
@@ -132,41 +140,66 @@ def delete_referral_profile(request):
 @permission_classes([IsAuthenticated])
 def get_referral_stats(request):
     """
-    Get referral statistics (for admin/analytics purposes)
+    Get referral statistics (for admin/analytics purposes), optionally for
+    one preferred `company`
     """
-    total_profiles = ReferralProfile.objects.count()
-    active_profiles = ReferralProfile.objects.filter(status='active').count()
-    hired_profiles = ReferralProfile.objects.filter(status='hired').count()
-    
-    # Top companies
-    from django.db.models import Count
-    top_companies = ReferralProfile.objects.values('preferred_company').annotate(
-        count=Count('preferred_company')
-    ).order_by('-count')[:10]
-    
-    return Response({
-        'total_profiles': total_profiles,
-        'active_profiles': active_profiles,
-        'hired_profiles': hired_profiles,
-        'top_companies': list(top_companies)
-    })
+    return Response(referral_stats(company=request.GET.get('company') or None))
 
 # Interview Experience APIs
 
+EXPERIENCE_BODY_FIELDS = ['round_details', 'overall_feedback', 'tips_and_advice']
+SEARCH_BATCH_SIZE = 200
+
+def serialize_experience(exp, user, compact=False):
+    """
+    Response dict for an experience; `compact` leaves out the long text fields
+    """
+    data = {
+        'id': exp.id,
+        'company': exp.company,
+        'role': exp.role,
+        'date': exp.date,
+        'experience_type': exp.experience_type,
+        'outcome': exp.outcome,
+        'difficulty_rating': exp.difficulty_rating,
+        'preparation_time': exp.preparation_time,
+        'is_anonymous': exp.is_anonymous,
+        'author': 'Anonymous' if exp.is_anonymous else exp.user.username,
+        'created_at': exp.created_at,
+        'is_own': exp.user_id == user.id
+    }
+    if not compact:
+        for field in EXPERIENCE_BODY_FIELDS:
+            data[field] = getattr(exp, field)
+    return data
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_interview_experiences(request):
     """
-    Get all interview experiences with filtering
+    Get all interview experiences with filtering.
+    With `search`, results come best match first, each with a `snippet` of
+    the matching text (matched terms wrapped in <mark>).
+
+    Pass `limit` and/or `cursor` for pages, newest first (best match first
+    when searching). `view=compact` leaves out round_details,
+    overall_feedback and tips_and_advice; fetch them from the detail endpoint.
     """
     # Get filter parameters
     company = request.GET.get('company', '')
     role = request.GET.get('role', '')
     experience_type = request.GET.get('experience_type', '')
     search = request.GET.get('search', '')
+    compact = request.GET.get('view') == 'compact'
+    paginated = 'limit' in request.GET or 'cursor' in request.GET
     
     # Build query
-    experiences = InterviewExperience.objects.all()
+    # Rows created before created_at was recorded have it NULL; they sort last
+    experiences = InterviewExperience.objects.select_related('user').order_by(
+        F('created_at').desc(nulls_last=True), '-id'
+    )
+    if compact:
+        experiences = experiences.defer(*EXPERIENCE_BODY_FIELDS)
     
     if company and company != 'all':
         experiences = experiences.filter(company__icontains=company)
@@ -177,7 +210,11 @@ def get_interview_experiences(request):
     if experience_type and experience_type != 'all':
         experiences = experiences.filter(experience_type=experience_type)
     
-    if search:
+    use_index = bool(search) and search_available()
+    if use_index and build_match_query(search) is None:
+        experiences = experiences.none()
+        use_index = False
+    elif search and not use_index:
         experiences = experiences.filter(
             Q(company__icontains=search) | 
             Q(role__icontains=search) |
@@ -186,29 +223,129 @@ def get_interview_experiences(request):
             Q(tips_and_advice__icontains=search)
         )
     
+    if paginated:
+        try:
+            if use_index:
+                return experiences_search_page(request, experiences, search, compact)
+            return experiences_page(request, experiences, compact)
+        except (ValueError, ValidationError):
+            return Response(
+                {'error': 'Invalid pagination parameters'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+    
+    snippets = None
+    if use_index:
+        # Full-text index: prefix matching, best matches first
+        ranked = search_experiences(search)
+        search_order = {experience_id: position for position, (experience_id, _) in enumerate(ranked)}
+        snippets = dict(ranked)
+        experiences = experiences.filter(id__in=RawSQL(MATCH_SQL, [build_match_query(search)]))
+        experiences = sorted(experiences, key=lambda exp: search_order[exp.id])
+    
     # Prepare response data
     experiences_data = []
     for exp in experiences:
-        experiences_data.append({
-            'id': exp.id,
-            'company': exp.company,
-            'role': exp.role,
-            'date': exp.date,
-            'round_details': exp.round_details,
-            'overall_feedback': exp.overall_feedback,
-            'experience_type': exp.experience_type,
-            'outcome': exp.outcome,
-            'difficulty_rating': exp.difficulty_rating,
-            'preparation_time': exp.preparation_time,
-            'tips_and_advice': exp.tips_and_advice,
-            'is_anonymous': exp.is_anonymous,
-            'author': 'Anonymous' if exp.is_anonymous else exp.user.username,
-            'created_at': exp.created_at,
-            'is_own': exp.user == request.user
-        })
+        experiences_data.append(serialize_experience(exp, request.user, compact))
+        if snippets is not None:
+            experiences_data[-1]['snippet'] = snippets.get(exp.id, '')
     
     return Response(experiences_data)
 
+def experiences_page(request, experiences, compact):
+    """
+    One keyset page of experiences, newest first, starting after the row
+    encoded in `cursor`. Rows without created_at come after all dated rows,
+    by id; their cursors carry a null created_at.
+    """
+    limit = parse_limit(request.GET.get('limit'), default=20, maximum=100)
+    cursor = request.GET.get('cursor')
+    
+    if cursor:
+        created_at, experience_id = decode_cursor(cursor, 2, types=((str, type(None)), int))
+        if created_at is None:
+            experiences = experiences.filter(created_at__isnull=True, id__lt=experience_id)
+        else:
+            experiences = experiences.filter(
+                Q(created_at__lt=created_at) |
+                Q(created_at=created_at, id__lt=experience_id) |
+                Q(created_at__isnull=True)
+            )
+    
+    page = list(experiences[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    
+    next_cursor = None
+    if has_more:
+        last = page[-1]
+        next_cursor = encode_cursor(last.created_at.isoformat() if last.created_at else None, last.id)
+    
+    return Response({
+        'results': [serialize_experience(exp, request.user, compact) for exp in page],
+        'next_cursor': next_cursor
+    })
+
+def experiences_search_page(request, experiences, search, compact):
+    """
+    One page of search results, best match first. The cursor is a position in
+    the FTS ranking: ranked ids are read in batches and checked against the
+    other filters with one query per batch, until the page is full.
+    """
+    limit = parse_limit(request.GET.get('limit'), default=20, maximum=100)
+    cursor = request.GET.get('cursor')
+    offset = 0
+    if cursor:
+        offset, = decode_cursor(cursor, 1, types=(int,))
+        if offset < 0:
+            raise ValueError('Invalid cursor')
+    
+    page = []
+    snippets = {}
+    next_offset = None
+    has_more = False
+    while not has_more:
+        ranked = search_experiences(search, limit=SEARCH_BATCH_SIZE, offset=offset)
+        if not ranked:
+            break
+        matching = experiences.in_bulk([experience_id for experience_id, _ in ranked])
+        for experience_id, snippet in ranked:
+            offset += 1
+            if experience_id not in matching:
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(matching[experience_id])
+            snippets[experience_id] = snippet
+            next_offset = offset
+    
+    results = []
+    for exp in page:
+        results.append(serialize_experience(exp, request.user, compact))
+        results[-1]['snippet'] = snippets[exp.id]
+    
+    return Response({
+        'results': results,
+        'next_cursor': encode_cursor(next_offset) if has_more else None
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_interview_experience(request, experience_id):
+    """
+    Get one interview experience with its full text
+    """
+    try:
+        experience = InterviewExperience.objects.select_related('user').get(id=experience_id)
+    except InterviewExperience.DoesNotExist:
+        return Response(
+            {'error': 'Experience not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(serialize_experience(experience, request.user))
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_interview_experience(request):
@@ -362,37 +499,13 @@ def delete_interview_experience(request, experience_id):
 @permission_classes([IsAuthenticated])
 def get_experience_stats(request):
     """
-    Get interview experience statistics
+    Get interview experience statistics, optionally drilled down to one
+    `company` and/or `role`
     """
-    total_experiences = InterviewExperience.objects.count()
-    
-    # Experience type breakdown
-    experience_types = InterviewExperience.objects.values('experience_type').annotate(
-        count=Count('experience_type')
-    )
-    
-    # Top companies
-    top_companies = InterviewExperience.objects.values('company').annotate(
-        count=Count('company')
-    ).order_by('-count')[:10]
-    
-    # Average difficulty rating
-    avg_difficulty = InterviewExperience.objects.aggregate(
-        avg_difficulty=Avg('difficulty_rating')
-    )['avg_difficulty'] or 0
-    
-    # Outcome breakdown
-    outcomes = InterviewExperience.objects.values('outcome').annotate(
-        count=Count('outcome')
-    )
-    
-    return Response({
-        'total_experiences': total_experiences,
-        'experience_types': list(experience_types),
-        'top_companies': list(top_companies),
-        'average_difficulty': round(avg_difficulty, 1),
-        'outcomes': list(outcomes)
-    })
+    return Response(experience_stats(
+        company=request.GET.get('company') or None,
+        role=request.GET.get('role') or None
+    ))
 
 # Mock Interview APIs
 
@@ -459,34 +572,42 @@ def create_mock_interview(request):
         # Get interviewer
         interviewer = User.objects.get(id=data['interviewer_id'])
         
-        # Parse scheduled time
-        scheduled_time = datetime.fromisoformat(data['scheduled_time'].replace('Z', '+00:00'))
-        
-        # Check if interviewer is available at this time
-        existing_interview = MockInterview.objects.filter(
-            interviewer=interviewer,
-            scheduled_time__date=scheduled_time.date(),
-            scheduled_time__hour=scheduled_time.hour,
-            status__in=['scheduled', 'in_progress']
-        ).exists()
+        if interviewer.id == request.user.id:
+            return Response(
+                {'error': 'You cannot interview yourself'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if existing_interview:
+        # Parse scheduled time and duration
+        scheduled_time = datetime.fromisoformat(data['scheduled_time'].replace('Z', '+00:00'))
+        duration_minutes = int(data.get('duration_minutes', 60))
+        if not 1 <= duration_minutes <= settings.MOCK_INTERVIEW_MAX_DURATION:
             return Response(
-                {'error': 'Interviewer is not available at this time'}, 
+                {'error': f'Duration must be between 1 and {settings.MOCK_INTERVIEW_MAX_DURATION} minutes'}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Create interview
-        interview = MockInterview.objects.create(
-            interviewer=interviewer,
-            interviewee=request.user,
-            scheduled_time=scheduled_time,
-            duration_minutes=int(data.get('duration_minutes', 60)),
-            interview_type=data['interview_type'],
-            notes=data.get('notes', ''),
-            technical_areas=data.get('technical_areas', ''),
-            meeting_link=data.get('meeting_link', '')
-        )
+        # Both calendars are checked for overlapping interviews inside the booking transaction
+        try:
+            interview = book_interview(
+                interviewer,
+                request.user,
+                scheduled_time,
+                duration_minutes,
+                interview_type=data['interview_type'],
+                notes=data.get('notes', ''),
+                technical_areas=data.get('technical_areas', ''),
+                meeting_link=data.get('meeting_link', '')
+            )
+        except BookingConflict as e:
+            if e.participant == 'interviewer':
+                error = 'Interviewer is not available at this time'
+            else:
+                error = 'You already have an interview at this time'
+            return Response(
+                {'error': error, 'conflicting_interview_id': e.interview_id}, 
+                status=status.HTTP_409_CONFLICT
+            )
         
         return Response({
             'message': 'Mock interview scheduled successfully',
@@ -506,7 +627,7 @@ def create_mock_interview(request):
         )
     except ValueError as e:
         return Response(
-            {'error': 'Invalid date format'}, 
+            {'error': 'Invalid date or duration format'}, 
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
@@ -527,6 +648,70 @@ def get_available_interviewers(request):
     
     return Response(list(interviewers))
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_free_slots(request):
+    """
+    Earliest free mock interview slots across all interviewers.
+    Query params: start, end (ISO date or datetime; server time zone if no offset),
+    duration_minutes (default 60), interview_type, limit (default 20).
+    A slot is free when both the interviewer and the current user have no
+    active interview overlapping it.
+    """
+    interview_types = dict(MockInterview.INTERVIEW_TYPE_CHOICES)
+    interview_type = request.GET.get('interview_type', '')
+    if interview_type not in interview_types:
+        return Response(
+            {'error': f'Interview type must be one of: {", ".join(interview_types)}'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    try:
+        start, end = (
+            datetime.fromisoformat(request.GET[param].replace('Z', '+00:00'))
+            for param in ('start', 'end')
+        )
+        duration_minutes = int(request.GET.get('duration_minutes', 60))
+        limit = parse_limit(request.GET.get('limit'), default=20, maximum=100)
+    except KeyError:
+        return Response(
+            {'error': 'Start and end are required'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    except ValueError:
+        return Response(
+            {'error': 'Invalid date, duration or limit format'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if timezone.is_naive(start):
+        start = timezone.make_aware(start)
+    if timezone.is_naive(end):
+        end = timezone.make_aware(end)
+    if not 1 <= duration_minutes <= settings.MOCK_INTERVIEW_MAX_DURATION:
+        return Response(
+            {'error': f'Duration must be between 1 and {settings.MOCK_INTERVIEW_MAX_DURATION} minutes'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if not start < end <= start + timedelta(days=settings.MOCK_INTERVIEW_SLOT_MAX_DAYS):
+        return Response(
+            {'error': f'End must be after start and at most {settings.MOCK_INTERVIEW_SLOT_MAX_DAYS} days later'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Same pool as get_available_interviewers: there is no per-type
+    # interviewer qualification yet, so every other active user is eligible
+    interviewers = dict(
+        User.objects.filter(is_active=True).exclude(id=request.user.id).values_list('id', 'username')
+    )
+    slots = find_free_slots(request.user.id, interviewers, start, end, duration_minutes, limit)
+    
+    return Response({
+        'interview_type': interview_type,
+        'duration_minutes': duration_minutes,
+        'slots': slots
+    })
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_mock_interview(request, interview_id):
@@ -1,4 +1,31 @@
 from django.contrib import admin
+from .models import RefreshJob, LeaderboardEntry, ScoreSnapshot, DailyScoreChange
 
-# Register your models here.
-# No models to register yet in leaderboard app
\ No newline at end of file
+
+@admin.register(RefreshJob)
+class RefreshJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'scope', 'status', 'requested_by', 'processed', 'total', 'updated', 'failed', 'throttled', 'created_at', 'finished_at')
+    list_filter = ('status', 'scope', 'created_at')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'heartbeat_at', 'results', 'cache_stats')
+
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ('user', 'college', 'score', 'rank', 'percentile', 'updated_at')
+    list_filter = ('college',)
+    search_fields = ('user__username', 'college')
+    readonly_fields = ('updated_at',)
+
+
+@admin.register(ScoreSnapshot)
+class ScoreSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('user', 'score', 'easy', 'medium', 'hard', 'recorded_at')
+    list_filter = ('recorded_at',)
+    search_fields = ('user__username',)
+
+
+@admin.register(DailyScoreChange)
+class DailyScoreChangeAdmin(admin.ModelAdmin):
+    list_display = ('user', 'college', 'day', 'delta')
+    list_filter = ('day', 'college')
+    search_fields = ('user__username',)
@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 
 
 class LeaderboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'leaderboard'
+
+    def ready(self):
+        from . import ranking
+
+        pre_save.connect(ranking.user_pre_save, sender=settings.AUTH_USER_MODEL)
+        post_save.connect(ranking.user_saved, sender=settings.AUTH_USER_MODEL)
+        pre_delete.connect(ranking.user_pre_delete, sender=settings.AUTH_USER_MODEL)
+        post_delete.connect(ranking.user_deleted, sender=settings.AUTH_USER_MODEL)
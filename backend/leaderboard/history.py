@@ -0,0 +1,111 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.utils import timezone
+from accounts.leetcode import calculate_leetcode_score
+from .models import ScoreSnapshot, DailyScoreChange
+
+User = get_user_model()
+
+CHUNK_SIZE = 500
+
+
+def record_snapshots(fetched):
+    """
+    Append a ScoreSnapshot for every (user, stats) pair whose Easy/Medium/Hard
+    counts differ from that user's latest snapshot, and add the score change to
+    today's DailyScoreChange bucket. A user's first snapshot is a baseline and
+    does not count as a change.
+    Returns: number of snapshots written
+    """
+    written = 0
+    for start in range(0, len(fetched), CHUNK_SIZE):
+        written += _record_chunk(fetched[start:start + CHUNK_SIZE])
+    return written
+
+
+def _record_chunk(fetched):
+    user_ids = [user.id for user, _ in fetched]
+    latest_ids = User.objects.filter(id__in=user_ids).annotate(
+        latest_id=Subquery(
+            ScoreSnapshot.objects.filter(
+                user_id=OuterRef('pk')
+            ).order_by('-recorded_at', '-id').values('id')[:1]
+        )
+    ).exclude(latest_id__isnull=True).values_list('latest_id', flat=True)
+    latest = {
+        snapshot.user_id: snapshot
+        for snapshot in ScoreSnapshot.objects.filter(id__in=list(latest_ids))
+    }
+
+    now = timezone.now()
+    snapshots = []
+    deltas = {}
+    for user, stats in fetched:
+        previous = latest.get(user.id)
+        counts = (stats["Easy"], stats["Medium"], stats["Hard"])
+        if previous and (previous.easy, previous.medium, previous.hard) == counts:
+            continue
+
+        score = calculate_leetcode_score(*counts)
+        snapshots.append(ScoreSnapshot(
+            user_id=user.id,
+            easy=counts[0],
+            medium=counts[1],
+            hard=counts[2],
+            score=score,
+            recorded_at=now
+        ))
+        if previous and score != previous.score:
+            deltas[user.id] = (user, score - previous.score)
+
+    ScoreSnapshot.objects.bulk_create(snapshots)
+    _add_daily_deltas(deltas, now.date())
+    return len(snapshots)
+
+
+def _add_daily_deltas(deltas, day):
+    """
+    Add each user's delta to their bucket for `day`. Missing buckets are
+    created first (conflicts ignored, so a concurrent writer's row wins),
+    then each (delta, college) group gets one atomic F() update, so
+    profile updates and refresh jobs writing the same bucket both count.
+    """
+    if not deltas:
+        return
+
+    groups = defaultdict(list)
+    for user_id, (user, delta) in deltas.items():
+        groups[(delta, user.college)].append(user_id)
+
+    with transaction.atomic():
+        DailyScoreChange.objects.bulk_create(
+            [DailyScoreChange(user_id=user_id, college=user.college, day=day) for user_id, (user, _) in deltas.items()],
+            ignore_conflicts=True
+        )
+        for (delta, college), user_ids in groups.items():
+            DailyScoreChange.objects.filter(user_id__in=user_ids, day=day).update(
+                delta=F('delta') + delta,
+                college=college
+            )
+
+
+def biggest_movers(college=None, days=7, limit=10):
+    """
+    Users with the largest score gain over the last `days` days, read from
+    the daily buckets (optionally restricted to one college)
+    """
+    since = timezone.now().date() - timedelta(days=days - 1)
+    changes = DailyScoreChange.objects.filter(day__gte=since)
+    if college:
+        changes = changes.filter(college=college)
+
+    return list(
+        changes.values(
+            'user_id', 'user__username', 'user__leetcode_username', 'user__leetcode_score'
+        ).annotate(
+            gain=Sum('delta')
+        ).filter(gain__gt=0).order_by('-gain', 'user_id')[:limit]
+    )
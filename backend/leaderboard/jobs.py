@@ -0,0 +1,130 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from accounts.stats_cache import counters_since, get_cache_counters
+from .models import RefreshJob
+from .refresh import refresh_scores
+
+
+def expire_stale_jobs():
+    """
+    Mark running jobs whose worker stopped reporting progress as failed,
+    so they no longer block new refreshes
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.LEETCODE_REFRESH_JOB_TIMEOUT)
+    return RefreshJob.objects.filter(
+        status='running',
+        heartbeat_at__lt=cutoff
+    ).update(
+        status='failed',
+        error='Worker stopped responding',
+        finished_at=timezone.now()
+    )
+
+
+def enqueue_refresh(requested_by=None, scope='all'):
+    """
+    Queue a score refresh, or join the one that is already queued/running.
+    Returns: (job, created)
+    """
+    expire_stale_jobs()
+
+    try:
+        with transaction.atomic():
+            job = RefreshJob.objects.create(scope=scope, requested_by=requested_by)
+        return job, True
+    except IntegrityError:
+        # The partial unique constraint allows only one active job per scope
+        job = RefreshJob.objects.filter(
+            scope=scope,
+            status__in=RefreshJob.ACTIVE_STATUSES
+        ).first()
+        if job is None:
+            # The active job finished between our insert and this lookup
+            return enqueue_refresh(requested_by, scope)
+        return job, False
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest queued job to running.
+    Returns: the claimed job, or None if the queue is empty
+    """
+    for job_id in RefreshJob.objects.filter(status='queued').order_by('created_at').values_list('id', flat=True):
+        now = timezone.now()
+        claimed = RefreshJob.objects.filter(id=job_id, status='queued').update(
+            status='running',
+            started_at=now,
+            heartbeat_at=now
+        )
+        if claimed:
+            return RefreshJob.objects.get(id=job_id)
+    return None
+
+
+def run_job(job):
+    """
+    Run a claimed refresh job, recording progress, results and the stats
+    cache counters of the run on the job row
+    """
+    cache_before = get_cache_counters()
+
+    def report_progress(processed, total, counts):
+        RefreshJob.objects.filter(id=job.id).update(
+            total=total,
+            processed=processed,
+            heartbeat_at=timezone.now(),
+            **counts
+        )
+
+    try:
+        outcome = refresh_scores(progress=report_progress)
+    except Exception as e:
+        RefreshJob.objects.filter(id=job.id).update(
+            status='failed',
+            error=str(e),
+            cache_stats=counters_since(cache_before),
+            finished_at=timezone.now()
+        )
+        raise
+
+    RefreshJob.objects.filter(id=job.id).update(
+        status='completed',
+        total=len(outcome['results']),
+        processed=len(outcome['results']),
+        updated=outcome['updated'],
+        unchanged=outcome['unchanged'],
+        failed=outcome['failed'],
+        throttled=outcome['throttled'],
+        results=outcome['results'],
+        cache_stats=counters_since(cache_before),
+        finished_at=timezone.now(),
+        heartbeat_at=timezone.now()
+    )
+    job.refresh_from_db()
+    return job
+
+
+def serialize_job(job, include_results=False):
+    """
+    JSON-ready representation of a refresh job for the status endpoint
+    """
+    data = {
+        'id': job.id,
+        'status': job.status,
+        'total': job.total,
+        'processed': job.processed,
+        'updated': job.updated,
+        'unchanged': job.unchanged,
+        'failed': job.failed,
+        'throttled': job.throttled,
+        'error': job.error,
+        'cache_stats': job.cache_stats,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at
+    }
+    if include_results:
+        data['results'] = job.results
+    return data
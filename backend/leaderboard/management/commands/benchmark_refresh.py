@@ -0,0 +1,99 @@
+import threading
+import time
+import uuid
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from accounts.fake_leetcode import make_server
+from leaderboard.models import LeaderboardEntry
+from leaderboard.ranking import rebuild_board
+from leaderboard.refresh import refresh_scores
+
+User = get_user_model()
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = 'Seed N users and time a full LeetCode score refresh against the fake GraphQL server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to seed')
+        parser.add_argument('--colleges', type=int, default=10, help='Spread seeded users over this many colleges')
+        parser.add_argument('--url', type=str, help='Use an already running fake server instead of starting one')
+        parser.add_argument('--latency', type=float, default=100, help='Fake server base latency in ms')
+        parser.add_argument('--jitter', type=float, default=50, help='Fake server extra random latency in ms')
+        parser.add_argument('--error-rate', type=float, default=0.0)
+        parser.add_argument('--throttle-rate', type=float, default=0.0)
+        parser.add_argument('--workers', type=int, help='Override LEETCODE_REFRESH_MAX_WORKERS')
+        parser.add_argument('--batch-size', type=int, help='Override LEETCODE_BATCH_SIZE')
+        parser.add_argument('--rate-limit', type=float, default=1000, help='Outbound requests per second allowed during the run')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded users afterwards')
+
+    def handle(self, *args, **options):
+        server = None
+        url = options['url']
+        if not url:
+            server = make_server(
+                latency=options['latency'] / 1000,
+                jitter=options['jitter'] / 1000,
+                error_rate=options['error_rate'],
+                throttle_rate=options['throttle_rate']
+            )
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            url = f"http://127.0.0.1:{server.server_address[1]}/graphql"
+        
+        prefix = f"bench-{uuid.uuid4().hex[:8]}-"
+        self.stdout.write(f"🌱 Seeding {options['users']} users ({prefix}*)")
+        User.objects.bulk_create([
+            User(
+                username=f"{prefix}{i}",
+                leetcode_username=f"{prefix}{i}",
+                college=f"Benchmark College {i % max(1, options['colleges'])}",
+                password='!'
+            )
+            for i in range(options['users'])
+        ], batch_size=1000)
+        
+        overrides = {
+            'LEETCODE_GRAPHQL_URL': url,
+            'LEETCODE_RATE_LIMIT': options['rate_limit'],
+            'LEETCODE_RATE_BURST': max(1, int(options['rate_limit'])),
+        }
+        if options['workers']:
+            overrides['LEETCODE_REFRESH_MAX_WORKERS'] = options['workers']
+        if options['batch_size']:
+            overrides['LEETCODE_BATCH_SIZE'] = options['batch_size']
+        
+        try:
+            self.stdout.write(f"⏱️ Refreshing against {url}")
+            with override_settings(**overrides):
+                started = time.monotonic()
+                outcome = refresh_scores(users=User.objects.filter(username__startswith=prefix))
+                elapsed = time.monotonic() - started
+        finally:
+            if not options['keep']:
+                User.objects.filter(username__startswith=prefix).delete()
+                rebuild_board(LeaderboardEntry.GLOBAL_BOARD)
+            if server:
+                server.shutdown()
+                server.server_close()
+        
+        latencies = outcome['timings']['fetch_latencies']
+        processed = len(outcome['results'])
+        
+        self.stdout.write(self.style.SUCCESS(f"\n✅ Refreshed {processed} users in {elapsed:.2f}s"))
+        self.stdout.write(f"   🚀 Throughput: {processed / elapsed if elapsed else 0:.1f} users/sec")
+        self.stdout.write(f"   📦 Fetch batches: {len(latencies)}")
+        self.stdout.write(f"   📶 Fetch latency p50: {percentile(latencies, 50) * 1000:.0f} ms, p99: {percentile(latencies, 99) * 1000:.0f} ms")
+        self.stdout.write(f"   💾 DB write time: {outcome['timings']['write_seconds']:.2f}s")
+        self.stdout.write(
+            f"   📊 Updated: {outcome['updated']}, unchanged: {outcome['unchanged']}, "
+            f"failed: {outcome['failed']}, throttled: {outcome['throttled']}"
+        )
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from leaderboard.ranking import rebuild_all_boards, rebuild_board
+from leaderboard.models import LeaderboardEntry
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized leaderboard rankings from users\' LeetCode scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--college', type=str, help='Only rebuild this college\'s board')
+        parser.add_argument('--global', action='store_true', dest='global_board', help='Only rebuild the global board')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        
+        if options['college']:
+            self.stdout.write(f"🔄 Rebuilding leaderboard for {options['college']}")
+            changed = rebuild_board(options['college'])
+        elif options['global_board']:
+            self.stdout.write("🔄 Rebuilding global leaderboard")
+            changed = rebuild_board(LeaderboardEntry.GLOBAL_BOARD)
+        else:
+            self.stdout.write("🔄 Rebuilding all leaderboards")
+            changed = rebuild_all_boards()
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Done in {time.monotonic() - started:.2f}s, {changed} entries changed"
+            )
+        )
+        self.stdout.write(f"   📊 Total entries: {LeaderboardEntry.objects.count()}")
@@ -0,0 +1,48 @@
+import time
+from django.core.management.base import BaseCommand
+from leaderboard.jobs import claim_next_job, expire_stale_jobs, run_job
+
+class Command(BaseCommand):
+    help = 'Process queued LeetCode score refresh jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process at most one job and exit')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds to wait when the queue is empty')
+
+    def handle(self, *args, **options):
+        self.stdout.write("👷 Refresh worker started")
+        
+        while True:
+            expire_stale_jobs()
+            job = claim_next_job()
+            
+            if job is None:
+                if options['once']:
+                    self.stdout.write("📭 No queued jobs")
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            
+            self.stdout.write(f"🔄 Running refresh job #{job.id}")
+            started = time.monotonic()
+            
+            try:
+                job = run_job(job)
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(f"❌ Job #{job.id} failed: {str(e)}")
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"✅ Job #{job.id} done in {time.monotonic() - started:.1f}s: "
+                        f"{job.updated} updated, {job.unchanged} unchanged, {job.failed} failed, {job.throttled} throttled"
+                    )
+                )
+                self.stdout.write(
+                    f"   🗄️ Stats cache: hit ratio {job.cache_stats['hit_ratio']:.0%}, "
+                    f"{job.cache_stats['fetches']} fetches, avg fetch {job.cache_stats['avg_fetch_seconds'] * 1000:.0f} ms"
+                )
+            
+            if options['once']:
+                return
@@ -1,4 +1,113 @@
 from django.db import models
+from django.conf import settings
+from django.utils import timezone
 
-# Create your models here.
 # Leaderboard functionality will be handled through the User model's leetcode_score field
+
+
+class RefreshJob(models.Model):
+    """Queued LeetCode score refresh, processed by the run_refresh_worker command"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    ACTIVE_STATUSES = ['queued', 'running']
+
+    scope = models.CharField(max_length=50, default='all', help_text="Which users the job refreshes")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='refresh_jobs'
+    )
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    throttled = models.PositiveIntegerField(default=0, help_text="Users skipped because LeetCode was rate limiting us")
+    results = models.JSONField(default=list, blank=True)
+    cache_stats = models.JSONField(default=dict, blank=True, help_text="LeetCode stats cache hit ratio and fetch latency during the job")
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True, help_text="Last progress update from the worker")
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            # Only one queued or running job per scope; concurrent triggers join it
+            models.UniqueConstraint(
+                fields=['scope'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_refresh_job'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Refresh job #{self.id} ({self.status})"
+
+
+class LeaderboardEntry(models.Model):
+    """Precomputed position of a user on a leaderboard, maintained by leaderboard.ranking"""
+    GLOBAL_BOARD = ''  # college value of the board that contains every ranked user
+
+    college = models.CharField(max_length=100, blank=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    score = models.IntegerField(default=0)
+    rank = models.PositiveIntegerField(help_text="Dense rank within the board, 1 is the top score")
+    users_below = models.PositiveIntegerField(default=0, help_text="Users on the board with a lower score")
+    percentile = models.FloatField(default=100.0, help_text="Percent of the board with a lower score")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['college', 'user']
+        indexes = [
+            models.Index(fields=['college', 'rank', 'user'], name='leaderboard_college_rank_idx'),
+            models.Index(fields=['college', '-score', 'user'], name='leaderboard_college_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} #{self.rank} on {self.college or 'global'} leaderboard ({self.score})"
+
+
+class ScoreSnapshot(models.Model):
+    """Append-only LeetCode solve counts, recorded only when the counts change"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='score_snapshots')
+    easy = models.PositiveIntegerField(default=0)
+    medium = models.PositiveIntegerField(default=0)
+    hard = models.PositiveIntegerField(default=0)
+    score = models.IntegerField(default=0)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['-recorded_at']
+        indexes = [
+            models.Index(fields=['user', '-recorded_at', '-id'], name='snapshot_user_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.score} at {self.recorded_at.strftime('%Y-%m-%d %H:%M')}"
+
+
+class DailyScoreChange(models.Model):
+    """Score gained by a user on one day, pre-aggregated from ScoreSnapshot for the movers query"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_score_changes')
+    college = models.CharField(max_length=100, blank=True)
+    day = models.DateField()
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'day']
+        indexes = [
+            models.Index(fields=['college', 'day'], name='daily_change_college_day_idx'),
+            models.Index(fields=['day'], name='daily_change_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.delta:+d} on {self.day}"
@@ -0,0 +1,237 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import ExpressionWrapper, F, FloatField, Window
+from django.db.models.functions import DenseRank, Rank
+from .models import LeaderboardEntry
+
+User = get_user_model()
+
+GLOBAL_BOARD = LeaderboardEntry.GLOBAL_BOARD
+
+
+def users_with_leetcode():
+    """
+    Users that have a LeetCode username linked to their account
+    """
+    return User.objects.filter(
+        leetcode_username__isnull=False
+    ).exclude(leetcode_username="")
+
+
+def boards_for(user):
+    """
+    Leaderboards a user belongs to: the global board plus their college's
+    """
+    if not user.leetcode_username:
+        return set()
+    boards = {GLOBAL_BOARD}
+    if user.college:
+        boards.add(user.college)
+    return boards
+
+
+def _percentile(users_below, board_size):
+    if board_size <= 1:
+        return 100.0
+    return users_below * 100.0 / (board_size - 1)
+
+
+def rebuild_board(college):
+    """
+    Recompute every entry of one board with window functions and write only
+    the rows whose score, rank or percentile changed.
+    Returns: number of entries created, updated or deleted
+    """
+    users = users_with_leetcode()
+    if college != GLOBAL_BOARD:
+        users = users.filter(college=college)
+
+    rows = list(users.annotate(
+        dense_rank=Window(DenseRank(), order_by=F('leetcode_score').desc()),
+        asc_rank=Window(Rank(), order_by=F('leetcode_score').asc())
+    ).values_list('id', 'leetcode_score', 'dense_rank', 'asc_rank'))
+
+    with transaction.atomic():
+        existing = {
+            entry.user_id: entry
+            for entry in LeaderboardEntry.objects.filter(college=college)
+        }
+
+        to_create = []
+        to_update = []
+        for user_id, score, rank, asc_rank in rows:
+            users_below = asc_rank - 1
+            percentile = _percentile(users_below, len(rows))
+            entry = existing.pop(user_id, None)
+
+            if entry is None:
+                to_create.append(LeaderboardEntry(
+                    college=college,
+                    user_id=user_id,
+                    score=score,
+                    rank=rank,
+                    users_below=users_below,
+                    percentile=percentile
+                ))
+            elif (entry.score, entry.rank, entry.users_below, entry.percentile) != (score, rank, users_below, percentile):
+                entry.score = score
+                entry.rank = rank
+                entry.users_below = users_below
+                entry.percentile = percentile
+                to_update.append(entry)
+
+        LeaderboardEntry.objects.bulk_create(to_create, batch_size=500)
+        LeaderboardEntry.objects.bulk_update(
+            to_update, ['score', 'rank', 'users_below', 'percentile', 'updated_at'], batch_size=500
+        )
+        if existing:
+            LeaderboardEntry.objects.filter(id__in=[entry.id for entry in existing.values()]).delete()
+
+    return len(to_create) + len(to_update) + len(existing)
+
+
+def rebuild_boards(colleges):
+    return sum(rebuild_board(college) for college in colleges)
+
+
+def rebuild_all_boards():
+    """
+    Rebuild the global board and every college board, dropping boards whose
+    college no longer has ranked users
+    """
+    colleges = set(
+        users_with_leetcode().exclude(college="").values_list('college', flat=True).distinct()
+    )
+    colleges.add(GLOBAL_BOARD)
+
+    LeaderboardEntry.objects.exclude(college__in=colleges).delete()
+    return rebuild_boards(sorted(colleges))
+
+
+# Signal receivers
+#
+# Saves and deletes of a single user (profile update, Django admin) keep the
+# boards in step. bulk_update and queryset.update() bypass them; the refresh
+# worker calls sync_users itself.
+
+RANKED_FIELDS = ('leetcode_score', 'college', 'leetcode_username')
+
+
+def user_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Remember the ranked fields as stored before this save
+    instance._ranking_previous = None
+    if raw or not instance.pk:
+        return
+    if update_fields is not None and not set(update_fields) & set(RANKED_FIELDS):
+        return
+    instance._ranking_previous = User.objects.filter(pk=instance.pk).values_list(*RANKED_FIELDS).first()
+
+
+def user_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_ranking_previous', None)
+    if created:
+        if boards_for(instance):
+            sync_user(instance)
+    elif previous is not None and previous != tuple(getattr(instance, field) for field in RANKED_FIELDS):
+        sync_user(instance)
+
+
+def user_pre_delete(sender, instance, **kwargs):
+    # The user's entries are cascade-deleted before post_delete runs
+    instance._ranking_boards = set(
+        LeaderboardEntry.objects.filter(user=instance).values_list('college', flat=True)
+    )
+
+
+def user_deleted(sender, instance, **kwargs):
+    # Everyone who was below the user moves up
+    rebuild_boards(sorted(getattr(instance, '_ranking_boards', set())))
+
+
+def _move_score(college, user_id, new_score):
+    """
+    Incrementally apply one user's score change to a board they are already on.
+    Only entries whose score lies between the old and new score are touched.
+    """
+    entries = LeaderboardEntry.objects.filter(college=college)
+    own = entries.select_for_update().get(user_id=user_id)
+    old_score = own.score
+    if old_score == new_score:
+        return
+
+    others = entries.exclude(user_id=user_id)
+
+    # Dense rank counts distinct higher scores: a score value that disappears
+    # moves everyone below it up one place, a new value moves them down one.
+    if not others.filter(score=old_score).exists():
+        others.filter(score__lt=old_score).update(rank=F('rank') - 1)
+    if not others.filter(score=new_score).exists():
+        others.filter(score__lt=new_score).update(rank=F('rank') + 1)
+
+    if new_score > old_score:
+        moved = others.filter(score__gt=old_score, score__lte=new_score)
+        moved.update(users_below=F('users_below') - 1)
+    else:
+        moved = others.filter(score__gt=new_score, score__lte=old_score)
+        moved.update(users_below=F('users_below') + 1)
+
+    board_size = entries.count()
+    if board_size > 1:
+        moved.update(percentile=ExpressionWrapper(
+            F('users_below') * 100.0 / (board_size - 1),
+            output_field=FloatField()
+        ))
+
+    tie = others.filter(score=new_score).first()
+    above = others.filter(score__gt=new_score).order_by('score').first()
+    if tie:
+        own.rank = tie.rank
+        own.users_below = tie.users_below
+    elif above:
+        own.rank = above.rank + 1
+        own.users_below = above.users_below - 1
+    else:
+        own.rank = 1
+        own.users_below = board_size - 1
+
+    own.score = new_score
+    own.percentile = _percentile(own.users_below, board_size)
+    own.save(update_fields=['score', 'rank', 'users_below', 'percentile', 'updated_at'])
+
+
+def sync_user(user):
+    """
+    Bring a single user's leaderboard entries up to date after their score,
+    college or LeetCode username changed. Score changes on boards the user is
+    already on are applied incrementally; joining or leaving a board rebuilds it.
+    """
+    current = set(
+        LeaderboardEntry.objects.filter(user=user).values_list('college', flat=True)
+    )
+    target = boards_for(user)
+
+    with transaction.atomic():
+        for college in current & target:
+            _move_score(college, user.id, user.leetcode_score)
+
+    rebuild_boards(sorted(current ^ target))
+
+
+def sync_users(users):
+    """
+    Bring the boards of many changed users up to date, rebuilding each
+    affected board once
+    """
+    users = list(users)
+    if not users:
+        return 0
+
+    colleges = set(
+        LeaderboardEntry.objects.filter(user__in=users).values_list('college', flat=True)
+    )
+    for user in users:
+        colleges |= boards_for(user)
+
+    return rebuild_boards(sorted(colleges))
@@ -0,0 +1,146 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from accounts.leetcode import LeetCodeThrottled, calculate_leetcode_score
+from accounts.stats_cache import get_cached_stats_batch
+from .history import record_snapshots
+from .ranking import sync_users, users_with_leetcode
+
+User = get_user_model()
+
+
+def refresh_scores(users=None, max_workers=None, chunk_size=None, batch_size=None, progress=None):
+    """
+    Refresh LeetCode scores with bounded concurrency.
+
+    Usernames are grouped into batches of `batch_size` (one GraphQL request
+    each) and the batches are fetched in a thread pool (the workers only talk
+    to LeetCode and the shared rate limiter); changed scores are written back
+    from the calling thread with bulk_update in chunks of `chunk_size`. Stats
+    fetched within the cache TTL are reused; stale entries are always
+    re-fetched. Leaderboards of users whose score changed are re-ranked once
+    at the end, and changed solve counts are appended to the score history.
+
+    `progress`, if given, is called from the calling thread as
+    progress(processed, total, counts) after every finished batch.
+
+    Returns: dict with updated/unchanged/failed/throttled counts, per-user
+    results and timings (per-batch fetch latencies and total DB write time)
+    """
+    if users is None:
+        users = users_with_leetcode()
+    if max_workers is None:
+        max_workers = settings.LEETCODE_REFRESH_MAX_WORKERS
+    if chunk_size is None:
+        chunk_size = settings.LEETCODE_REFRESH_CHUNK_SIZE
+    if batch_size is None:
+        batch_size = settings.LEETCODE_BATCH_SIZE
+    batch_size = max(1, batch_size)
+
+    users = list(users.only('id', 'username', 'leetcode_username', 'leetcode_score', 'college'))
+
+    results = []
+    changed = []
+    changed_all = []
+    fetched = []
+    counts = {'updated': 0, 'unchanged': 0, 'failed': 0, 'throttled': 0}
+    fetch_latencies = []
+    write_seconds = 0.0
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            usernames = [user.leetcode_username for user in batch]
+            futures[executor.submit(_fetch_batch, usernames, batch_size)] = batch
+
+        for future in as_completed(futures):
+            batch_stats, throttled, elapsed = future.result()
+            fetch_latencies.append(elapsed)
+            for user in futures[future]:
+                stats = batch_stats.get(user.leetcode_username)
+                outcome = _apply_stats(user, stats, user.leetcode_username in throttled, results)
+                counts[outcome] += 1
+                if stats:
+                    fetched.append((user, stats))
+                if outcome == 'updated':
+                    changed.append(user)
+                    changed_all.append(user)
+
+            if len(changed) >= chunk_size:
+                started = time.monotonic()
+                User.objects.bulk_update(changed, ['leetcode_score'], batch_size=chunk_size)
+                write_seconds += time.monotonic() - started
+                changed = []
+
+            if progress:
+                progress(len(results), len(users), dict(counts))
+
+    started = time.monotonic()
+    if changed:
+        User.objects.bulk_update(changed, ['leetcode_score'], batch_size=chunk_size)
+
+    sync_users(changed_all)
+    record_snapshots(fetched)
+    write_seconds += time.monotonic() - started
+
+    return {
+        **counts,
+        'results': results,
+        'timings': {
+            'fetch_latencies': fetch_latencies,
+            'write_seconds': write_seconds
+        }
+    }
+
+
+def _fetch_batch(usernames, batch_size):
+    """
+    Thread pool task: fetch one batch of usernames.
+    Returns: (dict username -> stats or None, set of throttled usernames, seconds taken)
+    """
+    started = time.monotonic()
+    try:
+        return get_cached_stats_batch(usernames, batch_size, False), set(), time.monotonic() - started
+    except LeetCodeThrottled as e:
+        return e.results, set(e.usernames), time.monotonic() - started
+    finally:
+        # The rate limiter opened a DB connection in this worker thread
+        connection.close()
+
+
+def _apply_stats(user, stats, throttled, results):
+    """
+    Apply fetched stats to `user` and record its outcome in `results`.
+    Returns: 'updated', 'unchanged', 'failed' or 'throttled'
+    """
+    if not stats:
+        outcome = 'throttled' if throttled else 'failed'
+        results.append({
+            'user_id': user.id,
+            'leetcode_username': user.leetcode_username,
+            'status': outcome,
+            'old_score': user.leetcode_score,
+            'new_score': None
+        })
+        return outcome
+
+    new_score = calculate_leetcode_score(
+        stats["Easy"],
+        stats["Medium"],
+        stats["Hard"]
+    )
+    old_score = user.leetcode_score
+    outcome = 'updated' if new_score != old_score else 'unchanged'
+    user.leetcode_score = new_score
+
+    results.append({
+        'user_id': user.id,
+        'leetcode_username': user.leetcode_username,
+        'status': outcome,
+        'old_score': old_score,
+        'new_score': new_score
+    })
+    return outcome
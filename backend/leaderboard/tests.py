@@ -1,3 +1,67 @@
+import random
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from .models import LeaderboardEntry
+from .ranking import rebuild_all_boards
 
-# Create your tests here.
+User = get_user_model()
+
+COLLEGES = ['', 'MIT', 'IIT', 'Stanford']
+
+
+class IncrementalRankingTests(TestCase):
+    """
+    Boards kept up to date by the user signals (sync_user and _move_score)
+    must match a full rebuild
+    """
+
+    def setUp(self):
+        self.random = random.Random(5)
+        User.objects.bulk_create([
+            User(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                leetcode_username=f'leet{i}',
+                college=self.random.choice(COLLEGES),
+                leetcode_score=self.random.randint(0, 30)
+            )
+            for i in range(40)
+        ])
+        self.users = list(User.objects.order_by('id'))
+        rebuild_all_boards()
+
+    def _entries(self):
+        return sorted(LeaderboardEntry.objects.values_list(
+            'college', 'user_id', 'score', 'rank', 'users_below', 'percentile'
+        ))
+
+    def assertMatchesRebuild(self):
+        incremental = self._entries()
+        rebuild_all_boards()
+        self.assertEqual(incremental, self._entries())
+
+    def test_score_edits(self):
+        # Small score range so edits create and remove ties
+        for _ in range(300):
+            user = self.random.choice(self.users)
+            user.leetcode_score = self.random.randint(0, 30)
+            user.save()
+        self.assertMatchesRebuild()
+
+    def test_college_and_link_changes(self):
+        for _ in range(60):
+            user = self.random.choice(self.users)
+            change = self.random.random()
+            if change < 0.4:
+                user.college = self.random.choice(COLLEGES)
+            elif change < 0.6:
+                user.leetcode_username = None if user.leetcode_username else f'leet{user.id}'
+            user.leetcode_score = self.random.randint(0, 30)
+            user.save()
+        self.assertMatchesRebuild()
+
+    def test_deletes(self):
+        for user in self.random.sample(self.users, 8):
+            user.delete()
+        User.objects.filter(id__in=[user.id for user in self.users[:5]]).delete()
+        self.assertMatchesRebuild()
@@ -1,7 +1,14 @@
 from django.urls import path
-from .views import get_leaderboard, refresh_all_scores
+from .views import (
+    get_leaderboard, get_my_rank, get_score_history, get_biggest_movers,
+    refresh_all_scores, get_refresh_job
+)
 
 urlpatterns = [
     path('', get_leaderboard, name='leaderboard'),
+    path('me/', get_my_rank, name='leaderboard_my_rank'),
+    path('history/', get_score_history, name='score_history'),
+    path('movers/', get_biggest_movers, name='biggest_movers'),
     path('refresh-scores/', refresh_all_scores, name='refresh_scores'),
+    path('refresh-scores/<int:job_id>/', get_refresh_job, name='refresh_job_status'),
 ]
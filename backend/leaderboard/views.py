@@ -4,133 +4,247 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import get_user_model
-import requests
-import json
+from django.db.models import Q
+from django.core.exceptions import ValidationError
+from PrepRot.pagination import encode_cursor, decode_cursor, parse_limit
+from .models import RefreshJob, LeaderboardEntry, ScoreSnapshot
+from .history import biggest_movers
+from .jobs import enqueue_refresh, serialize_job
 
 User = get_user_model()
 
-def get_leetcode_stats(username):
-    """
-    Fetch LeetCode stats using GraphQL API
-    Returns: dict with easy, medium, hard problem counts or None if error
-    """
-    url = "https://leetcode.com/graphql"
-    query = """
-    query userProfile($username: String!) {
-      matchedUser(username: $username) {
-        username
-        submitStats {
-          acSubmissionNum {
-            difficulty
-            count
-          }
-        }
-      }
+def serialize_entry(entry):
+    return {
+        'id': entry.user.id,
+        'username': entry.user.username,
+        'leetcode_username': entry.user.leetcode_username,
+        'leetcode_score': entry.score,
+        'college': entry.user.college,
+        'rank': entry.rank,
+        'percentile': round(entry.percentile, 2)
     }
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_leaderboard(request):
     """
+    Get college-specific leaderboard based on user's college.
+
+    Without parameters the whole board is returned as a list. Pass `limit`
+    and/or `cursor` for keyset pages ordered by (score desc, id), or
+    `around=me` with `k` for the user's own entry and the k users above and
+    below them.
+    """
+    # If user has no college, show the global board with all users
+    board = request.user.college or LeaderboardEntry.GLOBAL_BOARD
     
-    variables = {"username": username}
+    entries = LeaderboardEntry.objects.filter(
+        college=board
+    ).select_related('user').order_by('-score', 'user_id')
     
     try:
-        response = requests.post(url, json={"query": query, "variables": variables}, timeout=10)
-        
-        if response.status_code != 200:
-            return None
-            
-        data = response.json()
-        
-        # Check if user exists
-        if not data.get("data") or not data["data"].get("matchedUser"):
-            return None
-            
-        # Extract stats
-        stats = data["data"]["matchedUser"]["submitStats"]["acSubmissionNum"]
-        
-        # Convert to dict for easier access
-        result = {"Easy": 0, "Medium": 0, "Hard": 0}
-        for item in stats:
-            difficulty = item["difficulty"]
-            count = item["count"]
-            if difficulty in result:
-                result[difficulty] = count
-                
-        return result
+        if request.GET.get('around') == 'me':
+            return leaderboard_window(request, entries)
         
-    except Exception as e:
-        print(f"Error fetching LeetCode stats for {username}: {str(e)}")
-        return None
+        if 'limit' in request.GET or 'cursor' in request.GET:
+            return leaderboard_page(request, entries)
+    except ValueError:
+        return Response(
+            {'error': 'Invalid pagination parameters'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    leaderboard_data = []
+    for entry in entries:
+        leaderboard_data.append(serialize_entry(entry))
+    
+    return Response(leaderboard_data)
 
-def calculate_leetcode_score(easy, medium, hard):
+def leaderboard_page(request, entries):
     """
-    Calculate weighted LeetCode score: Easy×1 + Medium×2 + Hard×3
+    One keyset page of a board, starting after the row encoded in `cursor`
     """
-    return (easy * 1) + (medium * 2) + (hard * 3)
+    limit = parse_limit(request.GET.get('limit'))
+    cursor = request.GET.get('cursor')
+    
+    if cursor:
+        score, user_id = decode_cursor(cursor, 2, types=(int, int))
+        entries = entries.filter(
+            Q(score__lt=score) | Q(score=score, user_id__gt=user_id)
+        )
+    
+    page = list(entries[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit]
+    
+    return Response({
+        'results': [serialize_entry(entry) for entry in page],
+        'next_cursor': encode_cursor(page[-1].score, page[-1].user_id) if has_more else None
+    })
+
+def leaderboard_window(request, entries):
+    """
+    The current user's entry with the k entries directly above and below it
+    """
+    k = parse_limit(request.GET.get('k'), default=10, maximum=100)
+    
+    try:
+        me = entries.get(user=request.user)
+    except LeaderboardEntry.DoesNotExist:
+        return Response(
+            {'error': 'Link your LeetCode username to appear on the leaderboard'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    above = list(entries.filter(
+        Q(score__gt=me.score) | Q(score=me.score, user_id__lt=me.user_id)
+    ).order_by('score', '-user_id')[:k])
+    above.reverse()
+    
+    below = list(entries.filter(
+        Q(score__lt=me.score) | Q(score=me.score, user_id__gt=me.user_id)
+    )[:k + 1])
+    has_more = len(below) > k
+    below = below[:k]
+    
+    last = below[-1] if below else me
+    return Response({
+        'me': serialize_entry(me),
+        'results': [serialize_entry(entry) for entry in above + [me] + below],
+        'next_cursor': encode_cursor(last.score, last.user_id) if has_more else None
+    })
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def get_leaderboard(request):
+def get_my_rank(request):
     """
-    Get college-specific leaderboard based on user's college
-    """
-    user_college = request.user.college
-    
-    if not user_college:
-        # If user has no college, show all users
-        users = User.objects.filter(
-            leetcode_username__isnull=False
-        ).exclude(
-            leetcode_username=""
-        ).order_by('-leetcode_score')
-    else:
-        # Show only users from same college
-        users = User.objects.filter(
-            college=user_college,
-            leetcode_username__isnull=False
-        ).exclude(
-            leetcode_username=""
-        ).order_by('-leetcode_score')
+    Get current user's rank and percentile on their college and global boards
+    """
+    entries = LeaderboardEntry.objects.filter(user=request.user).select_related('user')
+    boards = {entry.college: serialize_entry(entry) for entry in entries}
     
-    leaderboard_data = []
-    for user in users:
-        leaderboard_data.append({
-            'id': user.id,
-            'username': user.username,
-            'leetcode_username': user.leetcode_username,
-            'leetcode_score': user.leetcode_score,
-            'college': user.college
-        })
+    if not boards:
+        return Response(
+            {'error': 'Link your LeetCode username to appear on the leaderboard'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
     
-    return Response(leaderboard_data)
+    return Response({
+        'college': boards.get(request.user.college) if request.user.college else None,
+        'global': boards.get(LeaderboardEntry.GLOBAL_BOARD)
+    })
 
-@api_view(['POST'])
+@api_view(['GET'])
 @permission_classes([IsAuthenticated])
-def refresh_all_scores(request):
+def get_score_history(request):
     """
-    Refresh LeetCode scores for all users with LeetCode usernames
+    Get a user's score history (defaults to the current user), newest first.
+    Paginate with `limit` and `cursor`.
     """
-    users_with_leetcode = User.objects.filter(
-        leetcode_username__isnull=False
-    ).exclude(leetcode_username="")
+    try:
+        user_id = int(request.GET.get('user_id') or request.user.id)
+    except ValueError:
+        return Response(
+            {'error': 'Invalid user id'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    updated_count = 0
-    failed_count = 0
+    snapshots = ScoreSnapshot.objects.filter(user_id=user_id).order_by('-recorded_at', '-id')
     
-    for user in users_with_leetcode:
-        stats = get_leetcode_stats(user.leetcode_username)
-        if stats:
-            new_score = calculate_leetcode_score(
-                stats["Easy"], 
-                stats["Medium"], 
-                stats["Hard"]
+    try:
+        limit = parse_limit(request.GET.get('limit'), default=100, maximum=500)
+        cursor = request.GET.get('cursor')
+        if cursor:
+            recorded_at, snapshot_id = decode_cursor(cursor, 2, types=(str, int))
+            snapshots = snapshots.filter(
+                Q(recorded_at__lt=recorded_at) | Q(recorded_at=recorded_at, id__lt=snapshot_id)
             )
-            user.leetcode_score = new_score
-            user.save()
-            updated_count += 1
-        else:
-            failed_count += 1
+        page = list(snapshots[:limit + 1])
+    except (ValueError, ValidationError):
+        return Response(
+            {'error': 'Invalid pagination parameters'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    has_more = len(page) > limit
+    page = page[:limit]
+    
+    history_data = []
+    for snapshot in page:
+        history_data.append({
+            'easy': snapshot.easy,
+            'medium': snapshot.medium,
+            'hard': snapshot.hard,
+            'score': snapshot.score,
+            'recorded_at': snapshot.recorded_at
+        })
     
     return Response({
-        'message': f'Updated {updated_count} users, {failed_count} failed',
-        'updated': updated_count,
-        'failed': failed_count
-    })
\ No newline at end of file
+        'results': history_data,
+        'next_cursor': encode_cursor(page[-1].recorded_at.isoformat(), page[-1].id) if has_more else None
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_biggest_movers(request):
+    """
+    Get the users in the current user's college (or globally, without a college)
+    who gained the most score over the last `days` days
+    """
+    try:
+        days = parse_limit(request.GET.get('days'), default=7, maximum=90)
+        limit = parse_limit(request.GET.get('limit'), default=10, maximum=100)
+    except ValueError:
+        return Response(
+            {'error': 'Invalid parameters'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    movers = biggest_movers(college=request.user.college, days=days, limit=limit)
+    
+    movers_data = []
+    for mover in movers:
+        movers_data.append({
+            'id': mover['user_id'],
+            'username': mover['user__username'],
+            'leetcode_username': mover['user__leetcode_username'],
+            'leetcode_score': mover['user__leetcode_score'],
+            'gain': mover['gain']
+        })
+    
+    return Response({
+        'college': request.user.college,
+        'days': days,
+        'movers': movers_data
+    })
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def refresh_all_scores(request):
+    """
+    Queue a refresh of LeetCode scores for all users with LeetCode usernames.
+    If a refresh is already queued or running, join it instead of starting another.
+    """
+    job, created = enqueue_refresh(requested_by=request.user)
+    
+    return Response({
+        'message': 'Score refresh queued' if created else 'Score refresh already in progress',
+        'joined': not created,
+        'job': serialize_job(job)
+    }, status=status.HTTP_202_ACCEPTED)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_refresh_job(request, job_id):
+    """
+    Get progress and results of a score refresh job
+    """
+    try:
+        job = RefreshJob.objects.get(id=job_id)
+    except RefreshJob.DoesNotExist:
+        return Response(
+            {'error': 'Refresh job not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(serialize_job(job, include_results=job.status == 'completed'))
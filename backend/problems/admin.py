@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Problem, SolvedProblem
+from .models import CompanyTag, Problem, SolvedCounter, SolvedProblem
+from .tags import sync_company_tags
 
 
 @admin.register(Problem)
@@ -9,6 +10,16 @@ class ProblemAdmin(admin.ModelAdmin):
     search_fields = ('title', 'topic', 'company_tags')
     readonly_fields = ('created_at',)
     fields = ('title', 'difficulty', 'topic', 'source', 'source_url', 'company_tags', 'created_at')
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        sync_company_tags([obj])
+
+
+@admin.register(CompanyTag)
+class CompanyTagAdmin(admin.ModelAdmin):
+    list_display = ('name', 'slug')
+    search_fields = ('name', 'slug')
 
 
 @admin.register(SolvedProblem)
@@ -16,4 +27,11 @@ class SolvedProblemAdmin(admin.ModelAdmin):
     list_display = ('user', 'problem', 'status', 'timestamp')
     list_filter = ('status', 'timestamp', 'problem__difficulty')
     search_fields = ('user__username', 'problem__title')
-    readonly_fields = ('timestamp',)
\ No newline at end of file
+    readonly_fields = ('timestamp',)
+
+
+@admin.register(SolvedCounter)
+class SolvedCounterAdmin(admin.ModelAdmin):
+    list_display = ('user', 'difficulty', 'topic', 'count')
+    list_filter = ('difficulty', 'topic')
+    search_fields = ('user__username',)
\ No newline at end of file
@@ -1,6 +1,25 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def install_problem_search(sender, using, **kwargs):
+    from django.db import connections
+    from .search import install_search_index
+    install_search_index(connections[using])
 
 
 class ProblemsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'problems'
+
+    def ready(self):
+        from .catalog import problem_changed
+        from .stats import invalidate_catalog_totals
+        from .sync import record_problem_deleted
+
+        post_migrate.connect(install_problem_search, sender=self)
+        post_save.connect(invalidate_catalog_totals, sender='problems.Problem')
+        post_delete.connect(invalidate_catalog_totals, sender='problems.Problem')
+        post_save.connect(problem_changed, sender='problems.Problem')
+        post_delete.connect(problem_changed, sender='problems.Problem')
+        post_delete.connect(record_problem_deleted, sender='problems.Problem')
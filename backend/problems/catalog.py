@@ -0,0 +1,162 @@
+"""
+In-process snapshot of the problem catalog.
+
+Every worker keeps one immutable CatalogSnapshot with the problems in
+(created_at, id) order and precomputed indexes by difficulty, topic and
+company. Writers bump the CatalogVersion row; readers compare it at most once
+every PROBLEM_CATALOG_CHECK_INTERVAL seconds and reload only when it changed.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from .bitmap import to_mask
+from .models import CatalogVersion, Problem
+
+CATALOG_VERSION_ID = 1
+SNAPSHOT_FIELDS = ['id', 'title', 'difficulty', 'topic', 'source', 'source_url', 'company_tags', 'created_at']
+
+_lock = threading.Lock()
+_snapshot = None
+_checked_at = 0.0
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the catalog at one version. Index values are tuples of
+    positions into `rows`, which are ordered by (created_at, id).
+    """
+
+    def __init__(self, version, rows, company_links):
+        self.version = version
+        self.rows = tuple(rows)
+        self.keys = [(row['created_at'], row['id']) for row in self.rows]
+        self.positions = {row['id']: position for position, row in enumerate(self.rows)}
+
+        by_difficulty = defaultdict(list)
+        by_topic = defaultdict(list)
+        for position, row in enumerate(self.rows):
+            by_difficulty[row['difficulty']].append(position)
+            by_topic[row['topic']].append(position)
+
+        by_company = defaultdict(list)
+        for problem_id, slug in company_links:
+            if problem_id in self.positions:
+                by_company[slug].append(self.positions[problem_id])
+
+        self.by_difficulty = {key: tuple(value) for key, value in by_difficulty.items()}
+        self.by_topic = {key: tuple(value) for key, value in by_topic.items()}
+        self.by_company = {key: tuple(sorted(value)) for key, value in by_company.items()}
+        self._company_masks = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def filter(self, difficulty=None, topic=None, company=None, ids=None):
+        """
+        Positions of the problems matching every given filter, in catalog
+        order. `topic` matches case-insensitively as a substring (like the
+        original icontains filter); `company` is a CompanyTag slug; `ids`
+        restricts to those problem ids.
+        """
+        candidates = []
+        if difficulty is not None:
+            candidates.append(self.by_difficulty.get(difficulty, ()))
+        if topic is not None:
+            needle = topic.lower()
+            candidates.append([
+                position
+                for name, positions in self.by_topic.items() if needle in name.lower()
+                for position in positions
+            ])
+        if company is not None:
+            candidates.append(self.by_company.get(company, ()))
+        if ids is not None:
+            candidates.append([self.positions[problem_id] for problem_id in ids if problem_id in self.positions])
+
+        if not candidates:
+            return range(len(self.rows))
+
+        # Start from the most selective index
+        candidates.sort(key=len)
+        matched = set(candidates[0])
+        for positions in candidates[1:]:
+            matched.intersection_update(positions)
+        return sorted(matched)
+
+    def company_mask(self, slug):
+        """
+        Int bitmap of the ids of `slug`'s problems (see problems.bitmap),
+        built on first use
+        """
+        mask = self._company_masks.get(slug)
+        if mask is None:
+            mask = to_mask(self.rows[position]['id'] for position in self.by_company.get(slug, ()))
+            self._company_masks[slug] = mask
+        return mask
+
+    def after(self, positions, created_at, problem_id):
+        """
+        The part of `positions` (in catalog order) that sorts after
+        (created_at, problem_id)
+        """
+        start = bisect_right(self.keys, (created_at, problem_id))
+        return positions[bisect_left(positions, start):]
+
+
+def bump_catalog_version():
+    """
+    Mark the catalog as changed so every worker reloads its snapshot.
+    Call after any write to problems or their company tags.
+    """
+    updated = CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID).update(
+        version=F('version') + 1,
+        updated_at=timezone.now()
+    )
+    if not updated:
+        CatalogVersion.objects.get_or_create(pk=CATALOG_VERSION_ID, defaults={'version': 1})
+
+
+def problem_changed(**kwargs):
+    """
+    Problem post_save/post_delete receiver
+    """
+    bump_catalog_version()
+
+
+def current_version():
+    return CatalogVersion.objects.filter(pk=CATALOG_VERSION_ID).values_list('version', flat=True).first() or 0
+
+
+def load_snapshot():
+    """
+    Read the whole catalog into a new snapshot. The version is read first, so
+    a change made during the load triggers another reload later.
+    """
+    version = current_version()
+    rows = list(Problem.objects.values(*SNAPSHOT_FIELDS).order_by('created_at', 'id'))
+    company_links = Problem.companies.through.objects.values_list('problem_id', 'companytag__slug')
+    return CatalogSnapshot(version, rows, company_links)
+
+
+def get_catalog():
+    """
+    This worker's catalog snapshot, reloaded if the catalog version moved
+    """
+    global _snapshot, _checked_at
+
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - _checked_at < settings.PROBLEM_CATALOG_CHECK_INTERVAL:
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and time.monotonic() - _checked_at < settings.PROBLEM_CATALOG_CHECK_INTERVAL:
+            return _snapshot
+        if _snapshot is None or current_version() != _snapshot.version:
+            _snapshot = load_snapshot()
+        _checked_at = time.monotonic()
+        return _snapshot
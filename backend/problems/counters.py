@@ -0,0 +1,104 @@
+from collections import Counter
+from django.db.models import Count, F
+from .models import SolvedCounter, SolvedProblem
+
+
+def apply_solved_delta(user, problems, delta):
+    """
+    Add `delta` to the user's counters for each of `problems` (solved with
+    delta=1, unsolved with delta=-1). Missing counter rows are created first,
+    then each (difficulty, topic) group gets one atomic F() update.
+    Call inside the transaction that changed the SolvedProblem rows, after
+    seed_counters ran in it before the change.
+    """
+    groups = Counter((problem.difficulty, problem.topic) for problem in problems)
+    if not groups:
+        return
+
+    SolvedCounter.objects.bulk_create(
+        [SolvedCounter(user=user, difficulty=difficulty, topic=topic) for difficulty, topic in groups],
+        ignore_conflicts=True
+    )
+    for (difficulty, topic), amount in groups.items():
+        SolvedCounter.objects.filter(user=user, difficulty=difficulty, topic=topic).update(
+            count=F('count') + amount * delta
+        )
+
+
+def _actual_counts(user_ids):
+    return {
+        (row['user_id'], row['problem__difficulty'], row['problem__topic']): row['count']
+        for row in SolvedProblem.objects.filter(user_id__in=user_ids)
+        .values('user_id', 'problem__difficulty', 'problem__topic')
+        .annotate(count=Count('pk'))
+        .order_by()
+    }
+
+
+def seed_counters(user):
+    """
+    Build the user's counters from SolvedProblem if they have none yet
+    (solves made before the counters existed). A user with no solves has no
+    counters either, which costs one empty GROUP BY per call.
+    Returns: True if the counters were seeded
+    """
+    if SolvedCounter.objects.filter(user=user).exists():
+        return False
+    SolvedCounter.objects.bulk_create(
+        [
+            SolvedCounter(user_id=user_id, difficulty=difficulty, topic=topic, count=count)
+            for (user_id, difficulty, topic), count in _actual_counts([user.id]).items()
+        ],
+        ignore_conflicts=True
+    )
+    return True
+
+
+def counter_rows(user):
+    """
+    The user's solved counts as (difficulty, topic, count) rows, seeded from
+    SolvedProblem on first read
+    """
+    seed_counters(user)
+    return list(
+        SolvedCounter.objects.filter(user=user, count__gt=0)
+        .values_list('difficulty', 'topic', 'count')
+    )
+
+
+def reconcile_counters(user_ids, fix=True):
+    """
+    Recompute the counters of `user_ids` from SolvedProblem and, if `fix`,
+    overwrite the ones that drifted (e.g. after a problem's difficulty or topic
+    was edited, or a problem was deleted).
+    Returns: list of (user_id, difficulty, topic, stored, actual) for every drifted counter
+    """
+    actual = _actual_counts(user_ids)
+    stored = {
+        (counter.user_id, counter.difficulty, counter.topic): counter
+        for counter in SolvedCounter.objects.filter(user_id__in=user_ids)
+    }
+
+    drift = []
+    to_create = []
+    to_update = []
+    for key in sorted(actual.keys() | stored.keys()):
+        count = actual.get(key, 0)
+        counter = stored.get(key)
+        stored_count = counter.count if counter else 0
+        if count == stored_count:
+            continue
+
+        drift.append((*key, stored_count, count))
+        if counter is None:
+            to_create.append(SolvedCounter(user_id=key[0], difficulty=key[1], topic=key[2], count=count))
+        else:
+            counter.count = count
+            to_update.append(counter)
+
+    if fix:
+        SolvedCounter.objects.bulk_create(to_create)
+        SolvedCounter.objects.bulk_update(to_update, ['count'])
+        SolvedCounter.objects.filter(user_id__in=user_ids, count=0).delete()
+
+    return drift
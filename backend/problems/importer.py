@@ -0,0 +1,134 @@
+import csv
+import json
+from itertools import islice
+from django.db import transaction
+from django.utils import timezone
+from .catalog import bump_catalog_version
+from .models import Problem
+from .stats import invalidate_catalog_totals
+from .tags import sync_company_tags
+
+IMPORT_FIELDS = ['title', 'difficulty', 'topic', 'source', 'source_url', 'company_tags']
+UPDATE_FIELDS = ['title', 'difficulty', 'topic', 'source', 'company_tags']
+DIFFICULTIES = {value for value, _ in Problem.DIFFICULTY_CHOICES}
+
+
+def read_rows(path, fmt=None):
+    """
+    Stream problem dicts from a JSONL (one object per line) or CSV file with
+    a header row. The format defaults to the file extension.
+    """
+    if fmt is None:
+        fmt = 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+    with open(path, newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Reported as an invalid row by clean_row
+                    yield line
+
+
+def clean_row(row):
+    """
+    Normalize one imported row.
+    Raises ValueError if it is missing required fields or has an unknown difficulty.
+    """
+    if not isinstance(row, dict):
+        raise ValueError('Row is not an object')
+
+    data = {field: str(row.get(field) or '').strip() for field in IMPORT_FIELDS}
+    data['difficulty'] = data['difficulty'].lower()
+
+    missing = [field for field in IMPORT_FIELDS if field != 'company_tags' and not data[field]]
+    if missing:
+        raise ValueError(f"Missing {', '.join(missing)}")
+    if data['difficulty'] not in DIFFICULTIES:
+        raise ValueError(f"Unknown difficulty {data['difficulty']!r}")
+    return data
+
+
+def import_problems(rows, chunk_size=1000, on_error=None):
+    """
+    Upsert problems keyed by source_url, `chunk_size` rows at a time.
+
+    Each chunk costs one SELECT for the existing rows, one bulk INSERT for
+    new rows, one bulk UPDATE for changed rows (unchanged rows are skipped)
+    and the company tag sync for the rows written. Every imported row must
+    have a source_url. source_url has no unique constraint, so existing
+    problems with a blank or repeated URL are tolerated: blank ones are left
+    alone and every row sharing an imported URL is updated. Only one chunk
+    is held in memory. Invalid rows are skipped and reported through
+    on_error(line_number, message).
+
+    Returns: dict with created/updated/unchanged/invalid counts
+    """
+    counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'invalid': 0}
+    numbered = enumerate(rows, start=1)
+
+    while True:
+        batch = list(islice(numbered, chunk_size))
+        if not batch:
+            break
+
+        chunk = {}
+        for line_number, row in batch:
+            try:
+                data = clean_row(row)
+            except ValueError as e:
+                counts['invalid'] += 1
+                if on_error:
+                    on_error(line_number, str(e))
+                continue
+            # A later row for the same URL wins
+            chunk[data['source_url']] = data
+        if chunk:
+            with transaction.atomic():
+                _import_chunk(chunk, counts)
+
+    if counts['created'] or counts['updated']:
+        invalidate_catalog_totals()
+        bump_catalog_version()
+    return counts
+
+
+def _import_chunk(chunk, counts):
+    existing = {}
+    for row in Problem.objects.filter(source_url__in=list(chunk)).values('id', 'source_url', *UPDATE_FIELDS):
+        existing.setdefault(row['source_url'], []).append(row)
+
+    created = []
+    updated = []
+    retagged = []
+    now = timezone.now()
+    for url, data in chunk.items():
+        current = existing.get(url)
+        if current is None:
+            counts['created'] += 1
+            created.append(Problem(**data))
+            retagged.append(url)
+            continue
+
+        stale = [row for row in current if any(row[field] != data[field] for field in UPDATE_FIELDS)]
+        if not stale:
+            counts['unchanged'] += 1
+            continue
+        counts['updated'] += 1
+        # bulk_update skips auto_now, so updated_at is set here
+        updated += [Problem(id=row['id'], updated_at=now, **data) for row in stale]
+        if any(row['company_tags'] != data['company_tags'] for row in stale):
+            retagged.append(url)
+
+    if created:
+        Problem.objects.bulk_create(created)
+    if updated:
+        Problem.objects.bulk_update(updated, [*UPDATE_FIELDS, 'updated_at'])
+    if retagged:
+        sync_company_tags(Problem.objects.filter(source_url__in=retagged).only('id', 'company_tags'))
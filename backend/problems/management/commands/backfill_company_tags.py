@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from problems.models import CompanyTag, Problem
+from problems.tags import CHUNK_SIZE, sync_company_tags
+
+class Command(BaseCommand):
+    help = 'Create CompanyTag rows and links from the existing Problem.company_tags text'
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        processed = 0
+        last_id = 0
+        
+        while True:
+            chunk = list(
+                Problem.objects.filter(id__gt=last_id).order_by('id').only('id', 'company_tags')[:CHUNK_SIZE]
+            )
+            if not chunk:
+                break
+            sync_company_tags(chunk)
+            processed += len(chunk)
+            last_id = chunk[-1].id
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ Backfilled company tags for {processed} problems in {time.monotonic() - started:.2f}s"
+            )
+        )
+        self.stdout.write(f"   🏢 Companies: {CompanyTag.objects.count()}")
@@ -1,10 +1,56 @@
+import time
 from django.core.management.base import BaseCommand
+from problems.importer import import_problems, read_rows
 from problems.models import Problem
 
 class Command(BaseCommand):
-    help = 'Populate database with sample DSA problems'
+    help = 'Populate database with sample DSA problems, or import them from a JSONL/CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            help='JSONL or CSV file of problems (title, difficulty, topic, source, source_url, company_tags)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=['jsonl', 'csv'],
+            help='File format (defaults to the file extension)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Rows upserted per query'
+        )
 
     def handle(self, *args, **options):
+        if options['file']:
+            rows = read_rows(options['file'], options['format'])
+        else:
+            rows = self.sample_problems()
+        
+        started = time.monotonic()
+        counts = import_problems(rows, max(1, options['chunk_size']), on_error=self.report_invalid)
+        elapsed = time.monotonic() - started
+        processed = counts['created'] + counts['updated'] + counts['unchanged']
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n🎉 Successfully processed {processed} problems in {elapsed:.2f}s "
+                f"({processed / elapsed if elapsed else 0:.0f} rows/s):"
+            )
+        )
+        self.stdout.write(f"   📝 Created: {counts['created']}")
+        self.stdout.write(f"   🔄 Updated: {counts['updated']}")
+        self.stdout.write(f"   ⏭️  Unchanged: {counts['unchanged']}")
+        if counts['invalid']:
+            self.stdout.write(self.style.WARNING(f"   ⚠️  Invalid: {counts['invalid']}"))
+        self.stdout.write(f"   📊 Total in database: {Problem.objects.count()}")
+
+    def report_invalid(self, line_number, message):
+        self.stdout.write(self.style.WARNING(f"⚠️  Skipped row {line_number}: {message}"))
+
+    def sample_problems(self):
         problems_data = [
             # Arrays
             {
@@ -275,35 +321,4 @@ class Command(BaseCommand):
             }
         ]
         
-        created_count = 0
-        updated_count = 0
-        
-        for problem_data in problems_data:
-            problem, created = Problem.objects.get_or_create(
-                title=problem_data['title'],
-                defaults=problem_data
-            )
-            
-            if created:
-                created_count += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f"✅ Created: {problem.title}")
-                )
-            else:
-                # Update existing problem with new data
-                for key, value in problem_data.items():
-                    setattr(problem, key, value)
-                problem.save()
-                updated_count += 1
-                self.stdout.write(
-                    self.style.WARNING(f"🔄 Updated: {problem.title}")
-                )
-        
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"\n🎉 Successfully processed {len(problems_data)} problems:"
-            )
-        )
-        self.stdout.write(f"   📝 Created: {created_count}")
-        self.stdout.write(f"   🔄 Updated: {updated_count}")
-        self.stdout.write(f"   📊 Total in database: {Problem.objects.count()}")
+        return problems_data
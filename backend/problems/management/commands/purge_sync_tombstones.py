@@ -0,0 +1,15 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from problems.sync import purge_tombstones
+
+class Command(BaseCommand):
+    help = 'Delete delta sync tombstones older than PROBLEM_SYNC_TOMBSTONE_DAYS'
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=settings.PROBLEM_SYNC_TOMBSTONE_DAYS)
+        deleted = purge_tombstones(before)
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Deleted {deleted} tombstones older than {before:%Y-%m-%d %H:%M}")
+        )
@@ -0,0 +1,74 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from problems.bitmap import reconcile_bitmaps
+from problems.counters import reconcile_counters
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Recompute per-user solved counters and bitmaps from solved problems and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Users reconciled per query batch'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without fixing it'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        fix = not options['dry_run']
+        started = time.monotonic()
+        
+        users = 0
+        drifted_users = set()
+        drift_count = 0
+        bitmap_drift_count = 0
+        last_id = 0
+        
+        while True:
+            user_ids = list(
+                User.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not user_ids:
+                break
+            
+            with transaction.atomic():
+                drift = reconcile_counters(user_ids, fix=fix)
+                bitmap_drift = reconcile_bitmaps(user_ids, fix=fix)
+            
+            for user_id, difficulty, topic, stored, actual in drift:
+                drifted_users.add(user_id)
+                self.stdout.write(
+                    self.style.WARNING(f"🔄 User {user_id} {difficulty}/{topic}: {stored} -> {actual}")
+                )
+            
+            for user_id, stored, actual in bitmap_drift:
+                drifted_users.add(user_id)
+                self.stdout.write(
+                    self.style.WARNING(f"🔄 User {user_id} bitmap: {stored} -> {actual} solved")
+                )
+            
+            users += len(user_ids)
+            drift_count += len(drift)
+            bitmap_drift_count += len(bitmap_drift)
+            last_id = user_ids[-1]
+        
+        verb = 'Found' if not fix else 'Fixed'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n🎉 Reconciled {users} users in {time.monotonic() - started:.2f}s"
+            )
+        )
+        self.stdout.write(
+            f"   🔄 {verb} {drift_count} drifted counters and {bitmap_drift_count} drifted bitmaps "
+            f"across {len(drifted_users)} users"
+        )
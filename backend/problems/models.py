@@ -2,6 +2,18 @@ from django.db import models
 from django.conf import settings
 
 
+class CompanyTag(models.Model):
+    """Company a problem was asked at, normalized from Problem.company_tags"""
+    name = models.CharField(max_length=100)
+    slug = models.SlugField(max_length=100, unique=True)  # lookup key for exact company filters
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
 class Problem(models.Model):
     """Problems table from ER diagram"""
     DIFFICULTY_CHOICES = [
@@ -14,9 +26,17 @@ class Problem(models.Model):
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES)
     topic = models.CharField(max_length=100)
     source = models.CharField(max_length=100)  # e.g., 'LeetCode', 'GeeksforGeeks'
-    source_url = models.URLField(blank=True)  # Link to the problem
+    source_url = models.URLField(blank=True, db_index=True)  # Link to the problem; the import key of populate_problems
     company_tags = models.TextField(blank=True)  # field for company tags
+    companies = models.ManyToManyField(CompanyTag, related_name='problems', blank=True)  # kept in sync with company_tags by problems.tags
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # delta sync watermark
+    
+    class Meta:
+        indexes = [
+            # Keyset pagination of the problem list
+            models.Index(fields=['created_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.difficulty})"
@@ -33,4 +53,60 @@ class SolvedProblem(models.Model):
         unique_together = ['user', 'problem']
     
     def __str__(self):
-        return f"{self.user.username} solved {self.problem.title}"
\ No newline at end of file
+        return f"{self.user.username} solved {self.problem.title}"
+
+class SolvedCounter(models.Model):
+    """Denormalized solved counts per user, difficulty and topic (see problems.counters)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    difficulty = models.CharField(max_length=10)
+    topic = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['user', 'difficulty', 'topic']
+    
+    def __str__(self):
+        return f"{self.user.username}: {self.count} {self.difficulty} {self.topic}"
+
+
+class CatalogVersion(models.Model):
+    """Single-row counter bumped on every catalog change (see problems.catalog)"""
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Catalog v{self.version}"
+
+
+class SolvedBitmap(models.Model):
+    """A user's solved problems as a bitmap: bit N is set when problem id N is solved (see problems.bitmap)"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True)
+    bits = models.BinaryField(default=bytes)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.user.username}'s solved bitmap"
+
+
+class ProblemTombstone(models.Model):
+    """Deleted problem, kept so delta sync clients can drop it (see problems.sync)"""
+    problem_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    def __str__(self):
+        return f"Problem {self.problem_id} deleted at {self.deleted_at}"
+
+
+class SolveTombstone(models.Model):
+    """Removed solve, kept so delta sync clients can clear it (see problems.sync)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    problem_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} unsolved problem {self.problem_id}"
@@ -0,0 +1,100 @@
+import re
+from django.db import connection
+
+FTS_TABLE = 'problems_problem_fts'
+
+# External-content FTS5 index over Problem.title and Problem.company_tags.
+# Triggers keep it in sync with every write, including bulk_create/update().
+INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title,
+        company_tags,
+        content='problems_problem',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON problems_problem BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company_tags)
+        VALUES (new.id, new.title, new.company_tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON problems_problem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company_tags)
+        VALUES ('delete', old.id, old.title, old.company_tags);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, company_tags ON problems_problem BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company_tags)
+        VALUES ('delete', old.id, old.title, old.company_tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, company_tags)
+        VALUES (new.id, new.title, new.company_tags);
+    END
+    """,
+]
+
+MATCH_SQL = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+# bm25 column weights: a title match counts ten times a company tag match
+RANK_SQL = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY bm25({FTS_TABLE}, 10.0, 1.0)"
+
+
+def search_available(using=connection):
+    """
+    Full-text search needs SQLite with FTS5; other backends fall back to LIKE
+    """
+    return using.vendor == 'sqlite' and FTS_TABLE in using.introspection.table_names()
+
+
+def install_search_index(using=connection):
+    """
+    Create the FTS5 table and its sync triggers if they do not exist yet,
+    indexing any problems that were already in the table
+    """
+    if using.vendor != 'sqlite':
+        return False
+    created = FTS_TABLE not in using.introspection.table_names()
+    with using.cursor() as cursor:
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+        if created:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return True
+
+
+def rebuild_search_index(using=connection):
+    """
+    Re-index every problem from scratch
+    """
+    install_search_index(using)
+    with using.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def build_match_query(search):
+    """
+    Turn free text into an FTS5 query where every word must match as a prefix,
+    e.g. "two su" -> "two"* "su"*
+    Returns: the MATCH expression, or None if the text has no searchable words
+    """
+    words = re.findall(r'\w+', search.lower())
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_problem_ids(search):
+    """
+    Problem ids matching `search`, best match first
+    """
+    match = build_match_query(search)
+    if match is None:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(RANK_SQL, [match])
+        return [row[0] for row in cursor.fetchall()]
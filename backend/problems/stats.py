@@ -0,0 +1,81 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from .counters import counter_rows
+from .models import Problem
+
+CATALOG_TOTALS_KEY = 'problems:catalog-totals'
+
+DIFFICULTIES = [value for value, _ in Problem.DIFFICULTY_CHOICES]
+
+
+def _count_rows(queryset, difficulty_field, topic_field):
+    """
+    One GROUP BY (difficulty, topic) query.
+    Returns: list of (difficulty, topic, count)
+    """
+    rows = queryset.values(difficulty_field, topic_field).annotate(count=Count('pk')).order_by()
+    return [(row[difficulty_field], row[topic_field], row['count']) for row in rows]
+
+
+def catalog_totals():
+    """
+    Problem counts per (difficulty, topic) for the whole catalog, cached
+    until a Problem changes (see invalidate_catalog_totals)
+    """
+    rows = cache.get(CATALOG_TOTALS_KEY)
+    if rows is None:
+        rows = _count_rows(Problem.objects.all(), 'difficulty', 'topic')
+        cache.set(CATALOG_TOTALS_KEY, rows, settings.PROBLEM_CATALOG_CACHE_TTL)
+    return rows
+
+
+def invalidate_catalog_totals(**kwargs):
+    """
+    Drop the cached catalog totals; also used as a Problem signal receiver
+    """
+    cache.delete(CATALOG_TOTALS_KEY)
+
+
+def solved_counts(user):
+    """
+    The user's solved counts per (difficulty, topic), read from the
+    denormalized counters (one indexed lookup on user), seeded from
+    SolvedProblem the first time
+    """
+    return counter_rows(user)
+
+
+def summarize(rows):
+    """
+    Fold (difficulty, topic, count) rows into per-difficulty and per-topic totals
+    """
+    by_difficulty = dict.fromkeys(DIFFICULTIES, 0)
+    by_topic = {}
+    for difficulty, topic, count in rows:
+        by_difficulty[difficulty] = by_difficulty.get(difficulty, 0) + count
+        by_topic[topic] = by_topic.get(topic, 0) + count
+    return {**by_difficulty, 'total': sum(by_difficulty.values())}, by_topic
+
+
+def build_user_stats(solved_rows, total_rows):
+    """
+    Response body for get_user_stats
+    """
+    solved, solved_by_topic = summarize(solved_rows)
+    total, total_by_topic = summarize(total_rows)
+
+    topics = [
+        {
+            'topic': topic,
+            'solved': solved_by_topic.get(topic, 0),
+            'total': count
+        }
+        for topic, count in sorted(total_by_topic.items())
+    ]
+
+    return {
+        'solved': solved,
+        'total': total,
+        'topics': topics
+    }
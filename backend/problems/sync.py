@@ -0,0 +1,119 @@
+"""
+Delta sync of the problem catalog and a user's solved state.
+
+Clients keep the `watermark` of their last sync and send it back as `since`.
+Problems are found through the indexed Problem.updated_at and solves through
+SolvedProblem.timestamp; deletions are recorded as tombstones and kept for
+PROBLEM_SYNC_TOMBSTONE_DAYS, after which the client gets a full resync.
+"""
+import hashlib
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags
+from .bitmap import load_solved_set
+from .models import Problem, ProblemTombstone, SolvedProblem, SolveTombstone
+
+SYNC_FIELDS = ['id', 'title', 'difficulty', 'topic', 'source', 'source_url', 'company_tags', 'created_at', 'updated_at']
+
+
+def record_problem_deleted(sender, instance, **kwargs):
+    """
+    Problem post_delete receiver
+    """
+    ProblemTombstone.objects.create(problem_id=instance.pk)
+
+
+def record_unsolved(user, problem_ids):
+    SolveTombstone.objects.bulk_create([
+        SolveTombstone(user=user, problem_id=problem_id) for problem_id in problem_ids
+    ])
+
+
+def parse_watermark(value):
+    """
+    Parse a `since` watermark.
+    Raises ValueError unless it is an ISO 8601 datetime with a timezone.
+    """
+    since = parse_datetime(value or '')
+    if since is None or timezone.is_naive(since):
+        raise ValueError('Invalid watermark')
+    return since
+
+
+def build_delta(user, since=None):
+    """
+    Everything that changed for `user` after `since`: created or updated
+    problems, deleted problem ids, and problem ids solved or unsolved since.
+    Without `since`, or when it predates the tombstone retention, returns the
+    full catalog and solved set with full=True.
+    """
+    now = timezone.now()
+    watermark = now - timedelta(seconds=settings.PROBLEM_SYNC_LAG)
+    full = since is None or since < now - timedelta(days=settings.PROBLEM_SYNC_TOMBSTONE_DAYS)
+
+    if full:
+        return {
+            'full': True,
+            'watermark': watermark.isoformat(),
+            'problems': list(Problem.objects.values(*SYNC_FIELDS).order_by('created_at', 'id')),
+            'deleted_problems': [],
+            'solved': list(load_solved_set(user)),
+            'unsolved': []
+        }
+
+    solved_now = SolvedProblem.objects.filter(user=user).values('problem_id')
+    return {
+        'full': False,
+        'watermark': watermark.isoformat(),
+        'problems': list(
+            Problem.objects.filter(updated_at__gt=since).values(*SYNC_FIELDS).order_by('updated_at', 'id')
+        ),
+        'deleted_problems': list(
+            ProblemTombstone.objects.filter(deleted_at__gt=since)
+            .values_list('problem_id', flat=True).distinct()
+        ),
+        'solved': list(
+            SolvedProblem.objects.filter(user=user, timestamp__gt=since)
+            .values_list('problem_id', flat=True)
+        ),
+        # A problem unsolved and solved again since the watermark is only reported as solved
+        'unsolved': list(
+            SolveTombstone.objects.filter(user=user, deleted_at__gt=since)
+            .exclude(problem_id__in=solved_now)
+            .values_list('problem_id', flat=True).distinct()
+        )
+    }
+
+
+def purge_tombstones(before):
+    """
+    Delete tombstones older than `before`.
+    Returns: number of tombstones deleted
+    """
+    problems, _ = ProblemTombstone.objects.filter(deleted_at__lt=before).delete()
+    solves, _ = SolveTombstone.objects.filter(deleted_at__lt=before).delete()
+    return problems + solves
+
+
+def list_etag(catalog_version, query_params, solved_bits=b''):
+    """
+    ETag of a problem list response: changes with the catalog version, the
+    query and the user's solved bitmap
+    """
+    digest = hashlib.sha1(f"{catalog_version}|{sorted(query_params.lists())}".encode())
+    digest.update(solved_bits)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request, etag):
+    """
+    Whether the request's If-None-Match header matches `etag` (weak comparison)
+    """
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [tag.removeprefix('W/') for tag in parse_etags(header)]
@@ -0,0 +1,71 @@
+from functools import lru_cache
+from django.db import connection, transaction
+from django.utils.text import slugify
+from .catalog import bump_catalog_version
+from .models import CompanyTag, Problem
+
+CHUNK_SIZE = 500
+
+
+def parse_company_tags(text):
+    """
+    Split a comma-separated company_tags string into {slug: name}, dropping
+    blanks and case-insensitive duplicates
+    """
+    tags = {}
+    for name in (text or '').split(','):
+        name = name.strip()
+        slug = company_slug(name)
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+@lru_cache(maxsize=4096)
+def company_slug(name):
+    # Few distinct companies, many repetitions: slugify once per name
+    return slugify(name.strip())
+
+
+def sync_company_tags(problems):
+    """
+    Rebuild the CompanyTag links of `problems` from their company_tags text,
+    creating missing tags. Uses a fixed number of queries per chunk of problems.
+    """
+    problems = list(problems)
+    for start in range(0, len(problems), CHUNK_SIZE):
+        with transaction.atomic():
+            _sync_chunk(problems[start:start + CHUNK_SIZE])
+    if problems:
+        bump_catalog_version()
+
+
+def _sync_chunk(problems):
+    parsed = {problem.id: parse_company_tags(problem.company_tags) for problem in problems}
+
+    names = {}
+    for tags in parsed.values():
+        for slug, name in tags.items():
+            names.setdefault(slug, name)
+
+    CompanyTag.objects.bulk_create(
+        [CompanyTag(slug=slug, name=name) for slug, name in names.items()],
+        ignore_conflicts=True
+    )
+    tag_ids = dict(CompanyTag.objects.filter(slug__in=list(names)).values_list('slug', 'id'))
+
+    # executemany skips per-row model instantiation for the link rows, which
+    # outnumber problems several times over
+    Through = Problem.companies.through
+    Through.objects.filter(problem_id__in=list(parsed)).delete()
+    links = [
+        (problem_id, tag_ids[slug])
+        for problem_id, tags in parsed.items()
+        for slug in tags
+    ]
+    if links:
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {connection.ops.quote_name(Through._meta.db_table)} (problem_id, companytag_id) VALUES (%s, %s)",
+                links
+            )
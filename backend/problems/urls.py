@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import get_problems, mark_problem_solved, get_user_stats
+from .views import get_problems, get_companies, sync_problems, mark_problem_solved, bulk_mark_problems, get_user_stats
 
 urlpatterns = [
     path('', get_problems, name='problems_list'),
     path('<int:problem_id>/solve/', mark_problem_solved, name='mark_problem_solved'),
+    path('solve/', bulk_mark_problems, name='bulk_mark_problems'),
     path('stats/', get_user_stats, name='user_problem_stats'),
+    path('companies/', get_companies, name='problem_companies'),
+    path('sync/', sync_problems, name='problems_sync'),
 ]
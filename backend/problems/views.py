@@ -4,61 +4,183 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import get_user_model
-from .models import Problem, SolvedProblem
-from django.db.models import Q
+from .models import CompanyTag, Problem, SolvedProblem
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from PrepRot.pagination import encode_cursor, decode_cursor, parse_limit
+from .bitmap import SolvedSet, load_solved_set, update_solved_bits
+from .counters import apply_solved_delta, seed_counters
+from .catalog import get_catalog
+from .search import search_available, search_problem_ids
+from .stats import build_user_stats, catalog_totals, solved_counts
+from .sync import build_delta, etag_matches, list_etag, parse_watermark, record_unsolved
+from .tags import company_slug
 
 User = get_user_model()
 
+PROBLEM_FIELDS = ['id', 'title', 'difficulty', 'topic', 'source', 'source_url', 'company_tags', 'is_solved', 'created_at']
+
+def parse_fields(value):
+    """
+    Parse a comma-separated `fields` parameter (default: every field).
+    Raises ValueError for unknown fields.
+    """
+    if not value:
+        return PROBLEM_FIELDS
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in PROBLEM_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(PROBLEM_FIELDS)}")
+    return fields
+
+def serialize_problem(row, fields, solved_problem_ids):
+    return {
+        field: row['id'] in solved_problem_ids if field == 'is_solved' else row[field]
+        for field in fields
+    }
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_problems(request):
     """
-    Get all problems with user's solved status
+    Get all problems with user's solved status.
+
+    `fields` limits the response to the listed fields. Without `limit` or
+    `cursor` every matching problem is returned as a list (search results
+    best match first); with them, keyset pages ordered by (created_at, id).
+    Filtering runs against this worker's in-memory catalog snapshot.
+    Responses carry an ETag; a matching If-None-Match gets a 304.
     """
     # Get filter parameters
     difficulty = request.GET.get('difficulty', '')
     topic = request.GET.get('topic', '')
     search = request.GET.get('search', '')
+    company = request.GET.get('company', '')
+    paginated = 'limit' in request.GET or 'cursor' in request.GET
     
-    # Build query
-    problems = Problem.objects.all()
-    
-    if difficulty and difficulty != 'all':
-        problems = problems.filter(difficulty=difficulty)
+    try:
+        fields = parse_fields(request.GET.get('fields'))
+    except ValueError as e:
+        return Response(
+            {'error': str(e)}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    if topic and topic != 'all':
-        problems = problems.filter(topic__icontains=topic)
+    catalog = get_catalog()
+    solved_problem_ids = load_solved_set(request.user) if 'is_solved' in fields else SolvedSet()
     
-    if search:
-        problems = problems.filter(
-            Q(title__icontains=search) | 
-            Q(company_tags__icontains=search)
-        )
+    # Same catalog, query and solved set as the client's copy: nothing to send
+    etag = list_etag(catalog.version, request.GET, solved_problem_ids.bits)
+    if etag_matches(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
     
-    problems = problems.order_by('created_at')
+    search_ids = None
+    if search and search_available():
+        # Full-text index: prefix matching, best matches first
+        search_ids = search_problem_ids(search)
+    elif search:
+        needle = search.lower()
+        search_ids = [
+            row['id'] for row in catalog.rows
+            if needle in row['title'].lower() or needle in row['company_tags'].lower()
+        ]
     
-    # Get user's solved problems
-    solved_problem_ids = set(
-        SolvedProblem.objects.filter(user=request.user)
-        .values_list('problem_id', flat=True)
+    positions = catalog.filter(
+        difficulty=difficulty if difficulty and difficulty != 'all' else None,
+        topic=topic if topic and topic != 'all' else None,
+        company=company_slug(company) if company and company != 'all' else None,
+        ids=search_ids
     )
     
+    if paginated:
+        response = problems_page(request, catalog, positions, fields, solved_problem_ids)
+        if response.status_code == status.HTTP_200_OK:
+            response['ETag'] = etag
+        return response
+    
+    problems = [catalog.rows[position] for position in positions]
+    if search_ids is not None:
+        search_order = {problem_id: rank for rank, problem_id in enumerate(search_ids)}
+        problems.sort(key=lambda problem: search_order[problem['id']])
+    
     # Prepare response data
     problems_data = []
     for problem in problems:
-        problems_data.append({
-            'id': problem.id,
-            'title': problem.title,
-            'difficulty': problem.difficulty,
-            'topic': problem.topic,
-            'source': problem.source,
-            'source_url': problem.source_url,
-            'company_tags': problem.company_tags,
-            'is_solved': problem.id in solved_problem_ids,
-            'created_at': problem.created_at
-        })
+        problems_data.append(serialize_problem(problem, fields, solved_problem_ids))
+    
+    return Response(problems_data, headers={'ETag': etag})
+
+def problems_page(request, catalog, positions, fields, solved_problem_ids):
+    """
+    One keyset page of problems, starting after the row encoded in `cursor`.
+    """
+    try:
+        limit = parse_limit(request.GET.get('limit'))
+        cursor = request.GET.get('cursor')
+        if cursor:
+            created_at, problem_id = decode_cursor(cursor, 2)
+            created_at = parse_datetime(created_at) if isinstance(created_at, str) else None
+            if created_at is None or timezone.is_naive(created_at) or not isinstance(problem_id, int):
+                raise ValueError('Invalid cursor')
+            positions = catalog.after(positions, created_at, problem_id)
+    except ValueError:
+        return Response(
+            {'error': 'Invalid pagination parameters'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    has_more = len(positions) > limit
+    page = [catalog.rows[position] for position in positions[:limit]]
     
-    return Response(problems_data)
+    last = page[-1] if page else None
+    return Response({
+        'results': [serialize_problem(problem, fields, solved_problem_ids) for problem in page],
+        'next_cursor': encode_cursor(last['created_at'].isoformat(), last['id']) if has_more else None
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_companies(request):
+    """
+    Get all company tags with their problem counts, most common first, and
+    how many of each company's problems the user has solved
+    """
+    companies = (
+        CompanyTag.objects.annotate(problem_count=Count('problems'))
+        .order_by('-problem_count', 'name')
+        .values('name', 'slug', 'problem_count')
+    )
+    catalog = get_catalog()
+    solved = load_solved_set(request.user)
+    
+    companies_data = []
+    for company in companies:
+        company['solved_count'] = solved.count_within(catalog.company_mask(company['slug']))
+        companies_data.append(company)
+    
+    return Response(companies_data)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_problems(request):
+    """
+    Get what changed in the catalog and the user's solved problems since the
+    `since` watermark of a previous sync (the full state without it).
+    Store the returned `watermark` and pass it as `since` next time.
+    """
+    since = request.GET.get('since')
+    
+    try:
+        since = parse_watermark(since) if since else None
+    except ValueError:
+        return Response(
+            {'error': 'Invalid since watermark'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    return Response(build_delta(request.user, since))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -77,14 +199,19 @@ def mark_problem_solved(request, problem_id):
     action = request.data.get('action', 'solve')  # 'solve' or 'unsolve'
     
     if action == 'solve':
-        solved_problem, created = SolvedProblem.objects.get_or_create(
-            user=request.user,
-            problem=problem,
-            defaults={'status': 'solved'}
-        )
-        if not created:
-            solved_problem.status = 'solved'
-            solved_problem.save()
+        with transaction.atomic():
+            seed_counters(request.user)
+            solved_problem, created = SolvedProblem.objects.get_or_create(
+                user=request.user,
+                problem=problem,
+                defaults={'status': 'solved'}
+            )
+            if created:
+                apply_solved_delta(request.user, [problem], 1)
+                update_solved_bits(request.user, added=[problem.id])
+            else:
+                solved_problem.status = 'solved'
+                solved_problem.save()
         
         return Response({
             'message': f'Problem "{problem.title}" marked as solved',
@@ -92,10 +219,16 @@ def mark_problem_solved(request, problem_id):
         })
     
     elif action == 'unsolve':
-        SolvedProblem.objects.filter(
-            user=request.user,
-            problem=problem
-        ).delete()
+        with transaction.atomic():
+            seed_counters(request.user)
+            deleted, _ = SolvedProblem.objects.filter(
+                user=request.user,
+                problem=problem
+            ).delete()
+            if deleted:
+                apply_solved_delta(request.user, [problem], -1)
+                update_solved_bits(request.user, removed=[problem.id])
+                record_unsolved(request.user, [problem.id])
         
         return Response({
             'message': f'Problem "{problem.title}" marked as unsolved',
@@ -108,35 +241,121 @@ def mark_problem_solved(request, problem_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-@api_view(['GET'])
+BULK_SOLVE_MAX_ITEMS = 500
+
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def get_user_stats(request):
+def bulk_mark_problems(request):
     """
-    Get user's problem solving statistics
+    Mark many problems as solved or unsolved in one request.
+
+    Body: {"items": [{"problem_id": 1, "action": "solve"}, ...]}
+    Returns one result per item, in order. Only the first item for a given
+    problem is applied; later ones are reported as duplicates.
     """
-    user_solved = SolvedProblem.objects.filter(user=request.user)
+    items = request.data.get('items') if isinstance(request.data, dict) else None
+    if not isinstance(items, list) or not items:
+        return Response(
+            {'error': 'items must be a non-empty list'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if len(items) > BULK_SOLVE_MAX_ITEMS:
+        return Response(
+            {'error': f'At most {BULK_SOLVE_MAX_ITEMS} items per request'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Validate the shape of every item before touching the database
+    results = []
+    actions = {}
+    for item in items:
+        problem_id = item.get('problem_id') if isinstance(item, dict) else None
+        action = item.get('action', 'solve') if isinstance(item, dict) else None
+        result = {'problem_id': problem_id, 'action': action}
+        results.append(result)
+        
+        if not isinstance(problem_id, int) or isinstance(problem_id, bool):
+            result['status'] = 'invalid'
+            result['error'] = 'problem_id must be an integer'
+        elif action not in ('solve', 'unsolve'):
+            result['status'] = 'invalid'
+            result['error'] = 'Invalid action. Use "solve" or "unsolve"'
+        elif problem_id in actions:
+            result['status'] = 'duplicate'
+            result['error'] = 'Problem already listed earlier in this request'
+        else:
+            actions[problem_id] = action
+    
+    problems = Problem.objects.in_bulk(list(actions))
     
-    # Count by difficulty
-    easy_count = user_solved.filter(problem__difficulty='easy').count()
-    medium_count = user_solved.filter(problem__difficulty='medium').count()
-    hard_count = user_solved.filter(problem__difficulty='hard').count()
+    with transaction.atomic():
+        # Concurrent bulk requests for the same user must not both count a
+        # problem as newly solved, so the user's row is locked before their
+        # solves are read. SQLite has no row locks; there the transaction
+        # already holds the database write lock (transaction_mode IMMEDIATE).
+        if connection.features.has_select_for_update:
+            list(User.objects.select_for_update().filter(id=request.user.id).values_list('id', flat=True))
+        seed_counters(request.user)
+        already_solved = set(
+            SolvedProblem.objects.filter(user=request.user, problem_id__in=list(problems))
+            .values_list('problem_id', flat=True)
+        )
+        to_solve = [
+            problem for problem_id, problem in problems.items()
+            if actions[problem_id] == 'solve' and problem_id not in already_solved
+        ]
+        to_unsolve = [
+            problem for problem_id, problem in problems.items()
+            if actions[problem_id] == 'unsolve' and problem_id in already_solved
+        ]
+        
+        SolvedProblem.objects.bulk_create(
+            [SolvedProblem(user=request.user, problem=problem, status='solved') for problem in to_solve],
+            ignore_conflicts=True
+        )
+        SolvedProblem.objects.filter(
+            user=request.user,
+            problem_id__in=[problem_id for problem_id in already_solved if actions[problem_id] == 'solve']
+        ).exclude(status='solved').update(status='solved')
+        if to_unsolve:
+            SolvedProblem.objects.filter(
+                user=request.user,
+                problem_id__in=[problem.id for problem in to_unsolve]
+            ).delete()
+        
+        apply_solved_delta(request.user, to_solve, 1)
+        apply_solved_delta(request.user, to_unsolve, -1)
+        update_solved_bits(
+            request.user,
+            added=[problem.id for problem in to_solve],
+            removed=[problem.id for problem in to_unsolve]
+        )
+        record_unsolved(request.user, [problem.id for problem in to_unsolve])
     
-    # Total counts
-    total_easy = Problem.objects.filter(difficulty='easy').count()
-    total_medium = Problem.objects.filter(difficulty='medium').count()
-    total_hard = Problem.objects.filter(difficulty='hard').count()
+    for result in results:
+        if 'status' in result:
+            continue
+        problem_id = result['problem_id']
+        if problem_id not in problems:
+            result['status'] = 'not_found'
+            result['error'] = 'Problem not found'
+        elif result['action'] == 'solve':
+            result['status'] = 'already_solved' if problem_id in already_solved else 'solved'
+            result['is_solved'] = True
+        else:
+            result['status'] = 'unsolved' if problem_id in already_solved else 'not_solved'
+            result['is_solved'] = False
     
     return Response({
-        'solved': {
-            'easy': easy_count,
-            'medium': medium_count,
-            'hard': hard_count,
-            'total': easy_count + medium_count + hard_count
-        },
-        'total': {
-            'easy': total_easy,
-            'medium': total_medium,
-            'hard': total_hard,
-            'total': total_easy + total_medium + total_hard
-        }
-    })
\ No newline at end of file
+        'results': results,
+        'solved': len(to_solve),
+        'unsolved': len(to_unsolve)
+    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_user_stats(request):
+    """
+    Get user's problem solving statistics, by difficulty and by topic
+    """
+    return Response(build_user_stats(solved_counts(request.user), catalog_totals()))
@@ -121,9 +121,19 @@ export default function Leaderboard() {
     setIsUpdatingScore(true);
     try {
       const token = localStorage.getItem("access");
-      await axios.post(`${API_URL}/leaderboard/refresh-scores/`, {}, {
+      const response = await axios.post(`${API_URL}/leaderboard/refresh-scores/`, {}, {
         headers: { Authorization: `Bearer ${token}` }
       });
+      
+      // The refresh runs as a background job; poll until it finishes
+      let job = response.data.job;
+      while (job.status === "queued" || job.status === "running") {
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const statusResponse = await axios.get(`${API_URL}/leaderboard/refresh-scores/${job.id}/`, {
+          headers: { Authorization: `Bearer ${token}` }
+        });
+        job = statusResponse.data;
+      }
       await fetchLeaderboard();
     } catch (error) {
       console.error("Failed to refresh scores:", error);